@@ -1,14 +1,17 @@
-import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.patches import Patch
 import pandas as pd
+from chart_render import subplots, finish_figure
+from survey_cube import ContingencyCube
+from survey_dataset import as_partitioned, count_table
+from survey_io import encode_response
 
 def plot_gender_distribution(combined_df):
     """
     Plots the gender distribution by group using a custom color palette.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing at least the columns 
+    combined_df (DataFrame, PartitionedSurvey or `survey_dataset.count_table` result): A pandas DataFrame containing at least the columns 
                              'ind_gender' and 'group'.
                              
     The function creates a count plot grouped by 'group' with customized 
@@ -16,8 +19,11 @@ def plot_gender_distribution(combined_df):
     """
     custom_palette = {'Host': '#46B4E7', 'Refugee': '#ff7e00'}
 
-    plt.figure(figsize=(7, 4))
-    ax = sns.countplot(data=combined_df, x='ind_gender', hue='group', palette=custom_palette, width=0.4)
+    counts = count_table(combined_df, 'ind_gender')
+
+    fig, ax = subplots(figsize=(7, 4))
+    sns.barplot(data=counts, x='ind_gender', y='count', hue='group', palette=custom_palette,
+                width=0.4, errorbar=None, ax=ax)
 
     ax.set_yticks([])
     ax.set_yticklabels([])
@@ -36,9 +42,9 @@ def plot_gender_distribution(combined_df):
     for c in ax.containers:
         ax.bar_label(c, fmt='%d', label_type='edge', padding=-12, color='white')
 
-    plt.title('Gender Distribution by Group', fontsize=15, fontweight='bold')
-    plt.tight_layout(pad=2)
-    plt.show()
+    ax.set_title('Gender Distribution by Group', fontsize=15, fontweight='bold')
+    fig.tight_layout(pad=2)
+    finish_figure(fig)
 
 
 def plot_age_distribution(combined_df):
@@ -46,7 +52,7 @@ def plot_age_distribution(combined_df):
     Plots the age distribution by group using a custom color palette and defined age order.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing at least the columns 
+    combined_df (DataFrame, PartitionedSurvey or `survey_dataset.count_table` result): A pandas DataFrame containing at least the columns 
                              'ind_age' and 'group'.
                              
     The function creates a count plot grouped by 'group' and 'ind_age' with 
@@ -55,19 +61,24 @@ def plot_age_distribution(combined_df):
     custom_palette = {'Host': '#46B4E7', 'Refugee': '#ff7e00'}
     age_order = ['0_4', '5_11', '12_17']
 
-    plt.figure(figsize=(7, 5))
-    ax = sns.countplot(
-        data=combined_df,
+    counts = count_table(combined_df, 'ind_age')
+
+    fig, ax = subplots(figsize=(7, 5))
+    sns.barplot(
+        data=counts,
         x='ind_age',
+        y='count',
         hue='group',
+        errorbar=None,
         order=age_order,
         palette=custom_palette,
-        width=0.5
+        width=0.5,
+        ax=ax
     )
 
-    plt.title('Age Distribution by Group', fontsize=14, fontweight='bold')
-    plt.xlabel('Age Group')
-    plt.ylabel('Count')
+    ax.set_title('Age Distribution by Group', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Age Group')
+    ax.set_ylabel('Count')
 
     for c in ax.containers:
         ax.bar_label(c, fmt='%d', label_type='edge', padding=-12, color='black')
@@ -85,8 +96,8 @@ def plot_age_distribution(combined_df):
         else:
             spine.set_visible(False)
 
-    plt.tight_layout(pad=2)
-    plt.show()
+    fig.tight_layout(pad=2)
+    finish_figure(fig)
 
 
 def plot_marital_status_by_age(combined_df):
@@ -94,10 +105,12 @@ def plot_marital_status_by_age(combined_df):
     Plots marital status distribution by age group for Host and Refugee communities in side-by-side subplots.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing the columns 'group', 'hh_marital', and 'ind_age'.
+    combined_df (DataFrame, PartitionedSurvey or ContingencyCube): A pandas DataFrame containing the columns 'group', 'hh_marital', and 'ind_age'.
     
     The function creates two count plots (one for each group) using a consistent age-based color palette,
     and includes labeled bars, cleaned spines, and a shared layout.
+
+    Bars are drawn from slices of one group x age x marital status cube (see `survey_cube.ContingencyCube`).
     """
     age_palette = {
         '0_4': '#b0b0b0',
@@ -105,12 +118,19 @@ def plot_marital_status_by_age(combined_df):
         '12_17': '#ff7e00'
     }
 
-    fig, axes = plt.subplots(1, 2, figsize=(10, 4), sharey=True)
+    if isinstance(combined_df, ContingencyCube):
+        cube = combined_df
+    else:
+        cube = ContingencyCube.from_frame(combined_df, 'hh_marital', ['group', 'ind_age'])
+
+    fig, axes = subplots(1, 2, figsize=(10, 4), sharey=True)
 
-    sns.countplot(
-        data=combined_df[combined_df['group'] == 'Host'],
+    sns.barplot(
+        data=cube.to_frame(['ind_age'], where={'group': 'Host'}),
         x='hh_marital',
+        y='count',
         hue='ind_age',
+        errorbar=None,
         hue_order=['0_4', '5_11', '12_17'],
         palette=age_palette,
         ax=axes[0]
@@ -119,10 +139,12 @@ def plot_marital_status_by_age(combined_df):
     axes[0].set_xlabel('Marital Status')
     axes[0].set_ylabel('Population Count')
 
-    sns.countplot(
-        data=combined_df[combined_df['group'] == 'Refugee'],
+    sns.barplot(
+        data=cube.to_frame(['ind_age'], where={'group': 'Refugee'}),
         x='hh_marital',
+        y='count',
         hue='ind_age',
+        errorbar=None,
         hue_order=['0_4', '5_11', '12_17'],
         palette=age_palette,
         ax=axes[1]
@@ -148,9 +170,9 @@ def plot_marital_status_by_age(combined_df):
                 spine.set_visible(False)
 
     fig.subplots_adjust(wspace=0.1)
-    plt.suptitle('Marital Status by Age Group: Host vs Refugee Communities', fontsize=15, fontweight='bold')
-    plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.show()
+    fig.suptitle('Marital Status by Age Group: Host vs Refugee Communities', fontsize=15, fontweight='bold')
+    fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+    finish_figure(fig)
 
 
 def plot_employment_status_by_group(combined_df):
@@ -158,7 +180,7 @@ def plot_employment_status_by_group(combined_df):
     Plots the employment status distribution by group using a custom color palette.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing the columns 
+    combined_df (DataFrame, PartitionedSurvey or `survey_dataset.count_table` result): A pandas DataFrame containing the columns 
                              'currently_working_contributin_1' and 'group'.
                              
     The function generates a count plot to show employment status for Host and Refugee groups,
@@ -166,13 +188,18 @@ def plot_employment_status_by_group(combined_df):
     """
     custom_palette = {'Host': '#46B4E7', 'Refugee': '#ff7e00'}
 
-    plt.figure(figsize=(6, 4))
-    ax = sns.countplot(
-        data=combined_df,
+    counts = count_table(combined_df, 'currently_working_contributin_1')
+
+    fig, ax = subplots(figsize=(6, 4))
+    sns.barplot(
+        data=counts,
         x='currently_working_contributin_1',
+        y='count',
         hue='group',
+        errorbar=None,
         palette=custom_palette,
-        width=0.5
+        width=0.5,
+        ax=ax
     )
 
     ax.set_yticks([])
@@ -188,33 +215,35 @@ def plot_employment_status_by_group(combined_df):
     ax.spines['bottom'].set_visible(True)
     ax.spines['bottom'].set_color('#d3d3d3')
 
-    plt.title('Employment Status by Group', fontsize=18, fontweight='bold')
-    plt.xlabel('Currently Working')
-    plt.ylabel('Population Count')
+    ax.set_title('Employment Status by Group', fontsize=18, fontweight='bold')
+    ax.set_xlabel('Currently Working')
+    ax.set_ylabel('Population Count')
 
     for c in ax.containers:
         ax.bar_label(c, fmt='%d', label_type='edge', padding=0, color='black')
 
-    plt.tight_layout(pad=-3)
-    plt.show()
+    fig.tight_layout(pad=-3)
+    finish_figure(fig)
 
 def plot_formal_education_enrollment(combined_df):
     """
     Plots the formal education enrollment status by group.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing the columns 
+    combined_df (DataFrame, PartitionedSurvey or `survey_dataset.count_table` result): A pandas DataFrame containing the columns 
                              'formal_edu_enrollment' and 'group'.
                              
     The function creates a count plot showing enrollment in formal education
     for Host and Refugee groups with customized axes, spines, and bar labels.
     """
-    plt.figure(figsize=(8, 6))
-    ax = sns.countplot(data=combined_df, x='formal_edu_enrollment', hue='group', width=0.4)
+    counts = count_table(combined_df, 'formal_edu_enrollment')
 
-    plt.title('Formal Education Enrollment by Group', fontsize=18)
-    plt.xlabel('Formal Education Enrollment')
-    plt.ylabel('Population Count')
+    fig, ax = subplots(figsize=(8, 6))
+    sns.barplot(data=counts, x='formal_edu_enrollment', y='count', hue='group', width=0.4, errorbar=None, ax=ax)
+
+    ax.set_title('Formal Education Enrollment by Group', fontsize=18)
+    ax.set_xlabel('Formal Education Enrollment')
+    ax.set_ylabel('Population Count')
 
     ax.set_yticklabels([])
     ax.tick_params(axis='y', length=0)
@@ -230,25 +259,27 @@ def plot_formal_education_enrollment(combined_df):
     for c in ax.containers:
         ax.bar_label(c, fmt='%d', label_type='edge', padding=0, color='black')
 
-    plt.show()
+    finish_figure(fig)
 
 def plot_nonformal_education_enrollment(combined_df):
     """
     Plots the non-formal education enrollment status by group.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing the columns 
+    combined_df (DataFrame, PartitionedSurvey or `survey_dataset.count_table` result): A pandas DataFrame containing the columns 
                              'nonformal_edu_enrollment' and 'group'.
                              
     The function creates a count plot showing enrollment in non-formal education
     for Host and Refugee groups with customized axes, spines, and bar labels.
     """
-    plt.figure(figsize=(8, 6))
-    ax = sns.countplot(data=combined_df, x='nonformal_edu_enrollment', hue='group', width=0.4)
+    counts = count_table(combined_df, 'nonformal_edu_enrollment')
 
-    plt.title('Non-Formal Education Enrollment by Group', fontsize=18)
-    plt.xlabel('Non-Formal Education Enrollment by Group')
-    plt.ylabel('Population Count')
+    fig, ax = subplots(figsize=(8, 6))
+    sns.barplot(data=counts, x='nonformal_edu_enrollment', y='count', hue='group', width=0.4, errorbar=None, ax=ax)
+
+    ax.set_title('Non-Formal Education Enrollment by Group', fontsize=18)
+    ax.set_xlabel('Non-Formal Education Enrollment by Group')
+    ax.set_ylabel('Population Count')
 
     ax.set_yticklabels([])
     ax.tick_params(axis='y', length=0)
@@ -264,14 +295,14 @@ def plot_nonformal_education_enrollment(combined_df):
     for c in ax.containers:
         ax.bar_label(c, fmt='%d', label_type='edge', padding=0, color='black')
 
-    plt.show()
+    finish_figure(fig)
 
 def plot_nonformal_education_by_gender(combined_df):
     """
     Plots non-formal education enrollment by gender using a custom color palette.
     
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing the columns 
+    combined_df (DataFrame, PartitionedSurvey, `survey_dataset.count_table` result or ContingencyCube): A pandas DataFrame containing the columns 
                              'nonformal_edu_enrollment' and 'ind_gender'.
                              
     The function renames 'ind_gender' to 'Gender' for display, and produces a count plot
@@ -279,18 +310,26 @@ def plot_nonformal_education_by_gender(combined_df):
     """
     custom_palette = {'male': '#00689D', 'female': '#4AC7DD'}
 
-    plt.figure(figsize=(8, 6))
-    ax = sns.countplot(
-        data=combined_df.rename(columns={'ind_gender': 'Gender'}),
+    if isinstance(combined_df, ContingencyCube):
+        counts = combined_df.to_frame(['ind_gender'])
+    else:
+        counts = count_table(combined_df, 'nonformal_edu_enrollment', by='ind_gender')
+
+    fig, ax = subplots(figsize=(8, 6))
+    sns.barplot(
+        data=counts.rename(columns={'ind_gender': 'Gender'}),
         x='nonformal_edu_enrollment',
+        y='count',
         hue='Gender',
+        errorbar=None,
         palette=custom_palette,
-        width=0.5
+        width=0.5,
+        ax=ax
     )
 
-    plt.title('Non- Formal Education Enrollment by Gender', fontsize=18)
-    plt.xlabel('Non-Formal Education Enrollment')
-    plt.ylabel('Population Count')
+    ax.set_title('Non- Formal Education Enrollment by Gender', fontsize=18)
+    ax.set_xlabel('Non-Formal Education Enrollment')
+    ax.set_ylabel('Population Count')
 
     ax.set_yticklabels([])
     ax.tick_params(axis='y', length=0)
@@ -306,7 +345,7 @@ def plot_nonformal_education_by_gender(combined_df):
     for c in ax.containers:
         ax.bar_label(c, fmt='%d', label_type='edge', padding=0, color='black')
 
-    plt.show()
+    finish_figure(fig)
 
 def plot_education_enrollment_weighted():
     """
@@ -326,7 +365,7 @@ def plot_education_enrollment_weighted():
         'weighted_percentage': [29.79, 70.16]
     })
 
-    fig, axes = plt.subplots(1, 2, figsize=(12, 6), sharey=True)
+    fig, axes = subplots(1, 2, figsize=(12, 6), sharey=True)
 
     host_color = '#377eb8'
     refugee_color = '#ff7f00'
@@ -348,41 +387,37 @@ def plot_education_enrollment_weighted():
     ]
     fig.legend(handles=legend_elements, loc='lower center', ncol=2, frameon=False, fontsize=12)
 
-    plt.tight_layout(rect=[0, 0.05, 1, 1])
-    plt.show()
+    fig.tight_layout(rect=[0, 0.05, 1, 1])
+    finish_figure(fig)
 
 def plot_weighted_edu_enrollment(combined_df):
     """
     Plots the weighted percentage of education enrollment (Yes/No) by group (e.g., Host, Refugee).
 
     Parameters:
-    combined_df (DataFrame): A pandas DataFrame containing the columns 'edu_enrollment', 
-                             'group', and 'weights'. Assumes 'edu_enrollment' has values 
-                             like 'Yes' or 'No' and requires normalization.
+    combined_df (DataFrame or PartitionedSurvey): A pandas DataFrame containing the columns 'edu_enrollment', 
+                             'group', and 'weights'. Answers are matched on their canonical
+                             codes ('yes'/'no', see `survey_io.encode_response`), so raw and
+                             normalized frames both work. combined_df is not modified.
 
     The function filters relevant data, computes weighted percentages, and displays
     a side-by-side bar plot with labeled percentages, styled axes, and custom annotations.
     """
-    combined_df['edu_enrollment'] = combined_df['edu_enrollment'].astype(str).str.strip().str.title()
-    edu_df = combined_df[combined_df['edu_enrollment'].isin(['Yes', 'No'])]
-
-    grouped_data = edu_df.groupby(['group', 'edu_enrollment'], as_index=False)['weights'].sum()
-
-    total_weight_per_group = edu_df.groupby('group')['weights'].sum().reset_index()
-    total_weight_per_group = total_weight_per_group.rename(columns={'weights': 'group_total_weight'})
-
-    grouped_data = grouped_data.merge(total_weight_per_group, on='group')
-    grouped_data['weighted_percentage'] = (grouped_data['weights'] / grouped_data['group_total_weight']) * 100
+    enrollment = as_partitioned(combined_df).weighted_proportions(
+        'edu_enrollment', 'weights', ['yes', 'no'], encoder=encode_response
+    )
+    grouped_data = enrollment.to_frame().rename(columns={'category': 'edu_enrollment'})
 
-    plt.figure(figsize=(10, 6))
+    fig, ax = subplots(figsize=(10, 6))
     palette = {'Yes': '#B2EC5D', 'No': '#94989c'}
-    ax = sns.barplot(
+    sns.barplot(
         x='group',
         y='weighted_percentage',
         hue='edu_enrollment',
         width=0.5,
         data=grouped_data,
-        palette=palette
+        palette=palette,
+        ax=ax
     )
 
     for container in ax.containers:
@@ -399,8 +434,8 @@ def plot_weighted_edu_enrollment(combined_df):
     ax.set_xlabel("Group")
     ax.set_ylabel("Percentage")
 
-    plt.title('Educational Enrollment Comparison: Host Communities vs Refugees', fontsize=16, pad=20)
-    plt.text(
+    ax.set_title('Educational Enrollment Comparison: Host Communities vs Refugees', fontsize=16, pad=20)
+    ax.text(
         0.5, 1.02,
         "Note: Only host communities access formal education; refugees receive non-formal education.",
         fontsize=10,
@@ -416,10 +451,10 @@ def plot_weighted_edu_enrollment(combined_df):
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
 
-    plt.legend(title='Enrollment', loc='upper right', frameon=False)
-    plt.subplots_adjust(top=0.85)
-    plt.tight_layout()
-    plt.show()
+    ax.legend(title='Enrollment', loc='upper right', frameon=False)
+    fig.subplots_adjust(top=0.85)
+    fig.tight_layout()
+    finish_figure(fig)
 
 
 def plot_education_barriers(barrier_df):
@@ -431,13 +466,14 @@ def plot_education_barriers(barrier_df):
     barrier_df (pd.DataFrame): A DataFrame containing the barriers, their weighted percentages, and group information.
     """
     # Visualization
-    plt.figure(figsize=(14, 8))
-    ax = sns.barplot(
+    fig, ax = subplots(figsize=(14, 8))
+    sns.barplot(
         data=barrier_df,
         x='weighted_percentage',
         y='barrier',
         hue='group',
-        palette={'Host': '#1f77b4', 'Refugee': '#ff7f0e'}
+        palette={'Host': '#1f77b4', 'Refugee': '#ff7f0e'},
+        ax=ax
     )
 
     # Add data labels INSIDE the bars
@@ -455,20 +491,20 @@ def plot_education_barriers(barrier_df):
             )
 
     # Title and axis labels
-    plt.title('Education Barriers by Group', fontsize=16, pad=20)
-    plt.xlabel('Percentage of Group Facing Barrier (%)', fontsize=12)
-    plt.ylabel('Barrier Type', fontsize=12)
+    ax.set_title('Education Barriers by Group', fontsize=16, pad=20)
+    ax.set_xlabel('Percentage of Group Facing Barrier (%)', fontsize=12)
+    ax.set_ylabel('Barrier Type', fontsize=12)
 
     # Customize the legend
-    plt.legend(title='Population Group', frameon=False)
+    ax.legend(title='Population Group', frameon=False)
 
     # Adjust spines for cleaner look
-    sns.despine(left=True, bottom=True)
+    sns.despine(ax=ax, left=True, bottom=True)
     ax.grid(False)  # Remove grid lines
 
     # Display the plot
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
 
 
 
@@ -478,17 +514,26 @@ def plot_school_attendance_reasons(edu_barriers):
     with weighted percentages and data labels. The plot distinguishes between 'Host' and 'Refugee' groups.
 
     Parameters:
-    edu_barriers (pd.DataFrame): A DataFrame containing the reasons, weighted percentages, and group information.
+    edu_barriers (dict): Ranked reasons per group ({group: {reason: weighted percentage}}), as returned
+                         by `survey_stats.top_categories`.
     """
+    # Long format, reasons ordered by their highest percentage in any group
+    rows = [(group, reason, percentage) for group, ranked in edu_barriers.items() for reason, percentage in ranked.items()]
+    barriers = pd.DataFrame(rows, columns=['group', 'reason', 'weighted_percentage'])
+    order = sorted(dict.fromkeys(barriers['reason']),
+                   key=lambda reason: -max(ranked.get(reason, 0) for ranked in edu_barriers.values()))
+
     # Plotting with data labels
-    plt.figure(figsize=(12, 8))
-    ax = sns.barplot(
-        data=edu_barriers.sort_values('weighted_percentage', ascending=False),
+    fig, ax = subplots(figsize=(12, 8))
+    sns.barplot(
+        data=barriers,
         y='reason',
         x='weighted_percentage',
         hue='group',
+        order=order,
         palette={'Host': '#1f77b4', 'Refugee': '#ff7f0e'},
-        orient='h'
+        orient='h',
+        ax=ax
     )
 
     # Add data labels (placed just outside bars)
@@ -509,20 +554,19 @@ def plot_school_attendance_reasons(edu_barriers):
     ax.set_xlim(right=ax.get_xlim()[1] * 1.1)  # 10% padding
 
     # Titles and labels
-    plt.title('Top Reasons for Not Attending School', fontsize=16)
-    plt.xlabel('Percentage of Out-of-School Children (%)', fontsize=12)
-    plt.ylabel('')
+    ax.set_title('Top Reasons for Not Attending School', fontsize=16)
+    ax.set_xlabel('Percentage of Out-of-School Children (%)', fontsize=12)
+    ax.set_ylabel('')
 
     # Customize the legend
-    plt.legend(title='Population Group')
+    ax.legend(title='Population Group')
 
     # Clean up the plot
-    sns.despine()
-    plt.tight_layout()
+    sns.despine(ax=ax)
+    fig.tight_layout()
 
     # Save and show the plot
-    plt.savefig("not_attending_school_reasons.png")
-    plt.show()
+    finish_figure(fig, "not_attending_school_reasons.png")
 
 
 
@@ -532,38 +576,41 @@ def plot_healthcare_need(combined_df):
     with weighted percentages and data labels.
 
     Parameters:
-    combined_df (pd.DataFrame): A DataFrame containing group, healthcare_needed, and weights columns.
+    combined_df (pd.DataFrame or PartitionedSurvey): A DataFrame containing group, healthcare_needed (or the raw
+                                health_needed_healthcare) and weights columns. Answers are
+                                matched on their canonical codes, whatever their original case.
     """
     # Custom color palette
-    custom_palette = {'yes': '#B2EC5D', 'no': '#94989c'}
+    custom_palette = {'Yes': '#B2EC5D', 'No': '#94989c'}
 
-    # Rename column for clarity in legend
-    combined_df = combined_df.rename(columns={'health_needed_healthcare': 'healthcare_needed'})
+    survey = as_partitioned(combined_df)
+
+    # Accept the raw column name as well as the renamed one
+    column = 'healthcare_needed' if 'healthcare_needed' in survey.columns else 'health_needed_healthcare'
 
     # Calculate weighted % of people who needed healthcare per group
-    healthcare_need = combined_df[combined_df['healthcare_needed'].notna()].groupby(['group', 'healthcare_needed']).apply(
-        lambda x: x['weights'].sum()
-    ).reset_index(name='weighted_count')
-
-    # Get total weights for normalization
-    totals = combined_df[combined_df['healthcare_needed'].notna()].groupby('group')['weights'].sum().to_dict()
-    healthcare_need['weighted_percent'] = healthcare_need.apply(
-        lambda row: (row['weighted_count'] / totals[row['group']]) * 100, axis=1
-    )
+    healthcare_need = survey.weighted_proportions(
+        column, 'weights', None, encoder=encode_response
+    ).to_frame().rename(columns={'category': 'healthcare_needed', 'weighted_percentage': 'weighted_percent'})
+
+    # Answers other than yes/no (e.g. 'Dont_Know') are drawn in a neutral grey
+    for answer in healthcare_need['healthcare_needed'].unique():
+        custom_palette.setdefault(answer, '#d3d3d3')
 
     # Plot
-    plt.figure(figsize=(10, 6))
-    ax = sns.barplot(
+    fig, ax = subplots(figsize=(10, 6))
+    sns.barplot(
         data=healthcare_need,
         x='group',
         y='weighted_percent',
         hue='healthcare_needed',
         width=0.5,
-        palette=custom_palette
+        palette=custom_palette,
+        ax=ax
     )
 
     # Remove top and right spines
-    sns.despine()
+    sns.despine(ax=ax)
 
     # Set axis line colors
     ax.spines['left'].set_color('grey')
@@ -578,19 +625,18 @@ def plot_healthcare_need(combined_df):
     ax.xaxis.label.set_color('grey')
 
     # Bold title
-    plt.title('Percentage of Individuals Needing Healthcare', color='black', fontsize=16 ,weight='bold')
+    ax.set_title('Percentage of Individuals Needing Healthcare', color='black', fontsize=16 ,weight='bold')
 
     # Axis labels
-    plt.ylabel('Weighted Percentage(%)')
-    plt.xlabel('Group')
+    ax.set_ylabel('Weighted Percentage(%)')
+    ax.set_xlabel('Group')
 
     # Add data labels on top of bars
     for container in ax.containers:
         ax.bar_label(container, fmt='%.1f%%', color='grey', fontsize=10, weight='bold')
 
-    plt.tight_layout()
-    plt.savefig("needing_healthcare.png")
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, "needing_healthcare.png")
 
 
 
@@ -607,7 +653,7 @@ def plot_healthcare_need_by_age_group(host_data, refugee_data, age_order):
     custom_palette = {'yes': '#B2EC5D', 'no': '#94989c'}
 
     # Set up subplots
-    fig, axes = plt.subplots(1, 2, figsize=(18, 7), sharey=True)
+    fig, axes = subplots(1, 2, figsize=(18, 7), sharey=True)
     fig.suptitle('Healthcare Need by Age Group for Host and Refugee Populations', fontsize=18, weight='bold', color='black', y=1.05)
 
     # Plot Host Population
@@ -657,9 +703,8 @@ def plot_healthcare_need_by_age_group(host_data, refugee_data, age_order):
     axes[0].legend().set_visible(False)  # Only one legend on the right
 
     # Adjust layout and save plot
-    plt.tight_layout()
-    plt.savefig("needing_healthcare_by_age.png")
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, "needing_healthcare_by_age.png")
 
 
 
@@ -674,14 +719,15 @@ def plot_healthcare_received(received_summary):
     custom_palette = {'Yes': '#B2EC5D', 'No': '#94989c'}
 
     # Plot
-    plt.figure(figsize=(10, 6))
-    ax = sns.barplot(
+    fig, ax = subplots(figsize=(10, 6))
+    sns.barplot(
         data=received_summary,
         x='group',
         y='weighted_percent',
         palette=custom_palette,
         width=0.5,
-        hue='health_received_healthcare'
+        hue='health_received_healthcare',
+        ax=ax
     )
 
     # Add data labels
@@ -702,17 +748,16 @@ def plot_healthcare_received(received_summary):
     ax.spines['bottom'].set_color('grey')
 
     # Set title and labels
-    plt.title('Healthcare Received by Group', weight='bold')
-    plt.ylabel('Weighted Percentage')
-    plt.xlabel('Group')
+    ax.set_title('Healthcare Received by Group', weight='bold')
+    ax.set_ylabel('Weighted Percentage')
+    ax.set_xlabel('Group')
 
     # Show legend
-    plt.legend(title='Received Healthcare')
+    ax.legend(title='Received Healthcare')
 
     # Adjust layout and save the plot
-    plt.tight_layout()
-    plt.savefig("received_healthcare.png")
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, "received_healthcare.png")
 
 
 
@@ -729,7 +774,7 @@ def plot_healthcare_received_by_age_group(host_data, refugee_data):
     custom_palette = {'yes': '#B2EC5D', 'no': '#94989c', 'dont_know': 'black'}
 
     # Set up subplots
-    fig, axes = plt.subplots(1, 2, figsize=(18, 7), sharey=True)
+    fig, axes = subplots(1, 2, figsize=(18, 7), sharey=True)
     fig.suptitle('Healthcare Received by Age Group for Host and Refugee Populations', fontsize=18, weight='bold', color='black', y=1.05)
 
     # Plot Host
@@ -789,9 +834,8 @@ def plot_healthcare_received_by_age_group(host_data, refugee_data):
     axes[0].legend().set_visible(False)  # Only one legend on the right
 
     # Adjust the layout to prevent overlap and make space for the legend
-    plt.tight_layout(rect=[0, 0, 0.9, 1])  # Make space on the right for the legend
-    plt.savefig("received_healthcare_by_group.png")
-    plt.show()
+    fig.tight_layout(rect=[0, 0, 0.9, 1])  # Make space on the right for the legend
+    finish_figure(fig, "received_healthcare_by_group.png")
 
 
 
@@ -803,15 +847,15 @@ def plot_treatment_types(treatment_summary):
     treatment_summary (pd.DataFrame): DataFrame containing 'treatment_type', 'weighted_percent', and 'group' columns.
     """
     # Plot
-    plt.figure(figsize=(14, 6))
-    ax = sns.barplot(data=treatment_summary, x='treatment_type', y='weighted_percent', hue='group')
+    fig, ax = subplots(figsize=(14, 6))
+    sns.barplot(data=treatment_summary, x='treatment_type', y='weighted_percent', hue='group', ax=ax)
 
     # Add percentage labels inside bars
     for container in ax.containers:
         ax.bar_label(container, labels=[f'{v:.1f}%' for v in container.datavalues], label_type='edge', padding=0, color='black', fontsize=9)
 
     # Customize title (larger and bold)
-    plt.title('Types of Treatment Needed by Group', fontsize=18, fontweight='bold')
+    ax.set_title('Types of Treatment Needed by Group', fontsize=18, fontweight='bold')
 
     # Axis customizations
     ax.spines['top'].set_visible(False)
@@ -824,10 +868,9 @@ def plot_treatment_types(treatment_summary):
     ax.set_ylabel('Weighted Percentage', fontsize=12)
     ax.set_xlabel('Treatment Type', fontsize=12)
 
-    plt.xticks(rotation=90)
-    plt.tight_layout()
-    plt.savefig("treatment_type.png")
-    plt.show()
+    ax.tick_params(axis='x', rotation=90)
+    fig.tight_layout()
+    finish_figure(fig, "treatment_type.png")
 
 
 
@@ -842,11 +885,12 @@ def plot_maternal_healthcare(maternal_melted):
     color_palette = sns.color_palette("coolwarm", n_colors=2)
 
     # Plot
-    plt.figure(figsize=(8, 4))
-    ax = sns.barplot(
+    fig, ax = subplots(figsize=(8, 4))
+    sns.barplot(
         x='Care Type', y='Percentage', hue='group',
         data=maternal_melted,
-        palette=color_palette
+        palette=color_palette,
+        ax=ax
     )
 
     # Add percentage labels
@@ -861,14 +905,14 @@ def plot_maternal_healthcare(maternal_melted):
     ax.grid(axis='y', alpha=0.3, linestyle='--', linewidth=0.5)
 
     # Titles and labels
-    plt.title('Maternal Healthcare Needs (Ages 12–17)', fontsize=16, fontweight='bold', pad=20)
-    plt.ylabel('Percentage Needing Care (%)', fontsize=12, alpha=0.7)
-    plt.xlabel('')
-    plt.xticks([0, 1], ['Antenatal Care', 'Safe Delivery'], fontsize=12, fontweight='bold')
-    plt.legend(title='Community', frameon=False, fontsize=12, loc='upper left')
+    ax.set_title('Maternal Healthcare Needs (Ages 12–17)', fontsize=16, fontweight='bold', pad=20)
+    ax.set_ylabel('Percentage Needing Care (%)', fontsize=12, alpha=0.7)
+    ax.set_xlabel('')
+    ax.set_xticks([0, 1], ['Antenatal Care', 'Safe Delivery'], fontsize=12, fontweight='bold')
+    ax.legend(title='Community', frameon=False, fontsize=12, loc='upper left')
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
 
 
 def plot_healthcare_services(service_df):
@@ -881,20 +925,19 @@ def plot_healthcare_services(service_df):
     Saves:
     - A PNG file named 'healthcare services.png'.
     """
-    plt.figure(figsize=(12, 7))
-    ax = sns.barplot(data=service_df, x='percentage', y='service', hue='group')
+    fig, ax = subplots(figsize=(12, 7))
+    sns.barplot(data=service_df, x='percentage', y='service', hue='group', ax=ax)
 
     # Add data labels
     for container in ax.containers:
         ax.bar_label(container, label_type='edge', padding=3, fmt='%.1f%%')
 
-    plt.title("Types of Healthcare Services Needed by Group")
-    plt.xlabel("Percentage (%)")
-    plt.ylabel("Healthcare Service")
+    ax.set_title("Types of Healthcare Services Needed by Group")
+    ax.set_xlabel("Percentage (%)")
+    ax.set_ylabel("Healthcare Service")
 
     # Move legend inside, lower right
     ax.legend(loc='lower right', frameon=True)
 
-    plt.tight_layout()
-    plt.savefig("healthcare services.png")
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, "healthcare services.png")
@@ -0,0 +1,121 @@
+import functools
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from chart_render import set_headless, is_headless, recording_outputs, set_output, output_settings
+
+
+def _job_call(job):
+    """
+    Splits a job into (plot function, args, kwargs).
+    """
+    if len(job) == 2:
+        plot_function, data = job
+        return plot_function, (data,), {}
+    plot_function, args, kwargs = job
+    return plot_function, tuple(args), dict(kwargs)
+
+
+def _function_name(plot_function):
+    # functools.partial objects and other callables have no __name__
+    while isinstance(plot_function, functools.partial):
+        plot_function = plot_function.func
+    return getattr(plot_function, '__name__', repr(plot_function))
+
+
+def _init_worker(profile, output_dir):
+    # Runs once per worker: matplotlib is imported and switched to Agg before the first job.
+    # Only workers change the backend, which would close the figures open in the caller
+    matplotlib.use('Agg', force=True)
+    set_headless()
+    set_output(profile, output_dir or '')
+
+
+def _render_job(job):
+    plot_function, args, kwargs = _job_call(job)
+    start = time.perf_counter()
+    error = None
+    with recording_outputs() as files:
+        try:
+            plot_function(*args, **kwargs)
+        except Exception:
+            error = traceback.format_exc(limit=3)
+    return time.perf_counter() - start, os.getpid(), error, files
+
+
+def render_charts(jobs, processes=None, cache=None):
+    """
+    Renders a catalogue of charts, spreading the jobs over a process pool.
+
+    Each worker imports matplotlib once and renders headless (see
+    `chart_render.set_headless`) with the caller's output profile and folder, so charts are
+    only written to their files. A job that
+    raises does not stop the others; its traceback is reported in the `error` column.
+
+    Parameters:
+    - jobs (list): One entry per chart, either (plot function, data) for the usual
+      one-argument plot functions, e.g. (possession_of_immunization_cards, card_rates), or
+      (plot function, args, kwargs), e.g.
+      (plot_school_interruption_reasons, (host_reasons, refugee_reasons), {}).
+      Plot functions must be importable from a module (not defined in the notebook) and
+      the data picklable.
+    - processes (int, optional): Worker processes. Defaults to the number of CPUs;
+      1 renders the jobs one after the other in the current process.
+    - cache (RenderCache, optional): Render cache (see `chart_cache`). Jobs whose chart is
+      up to date are skipped, and the files written by the others are added to its manifest.
+
+    Returns:
+    - DataFrame: One row per job, in the order of `jobs`, with the columns function,
+      seconds (render time of the job), worker (process id), skipped (True when the cache
+      had the chart) and error (None when the chart was written). The total wall-clock
+      time is in `.attrs['wall_seconds']`.
+    """
+    jobs = list(jobs)
+    start = time.perf_counter()
+
+    keys = [None] * len(jobs)
+    results = [(0.0, None, None, [])] * len(jobs)
+    pending = list(range(len(jobs)))
+    if cache is not None:
+        keys = [cache.key(*_job_call(job)) for job in jobs]
+        pending = [i for i in pending if not cache.is_fresh(keys[i])]
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, len(pending)))
+
+    if processes == 1:
+        was_headless = is_headless()
+        set_headless()
+        try:
+            rendered = [_render_job(jobs[i]) for i in pending]
+        finally:
+            set_headless(was_headless)
+    else:
+        settings = output_settings()
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(settings['profile'], settings['output_dir'])) as pool:
+            rendered = list(pool.map(_render_job, [jobs[i] for i in pending]))
+    for i, result in zip(pending, rendered):
+        results[i] = result
+        if cache is not None and result[2] is None:
+            cache.record(keys[i], _job_call(jobs[i])[0], result[3])
+    wall_seconds = time.perf_counter() - start
+
+    skipped = np.ones(len(jobs), dtype=bool)
+    skipped[pending] = False
+    timings = pd.DataFrame({
+        'function': [_function_name(_job_call(job)[0]) for job in jobs],
+        'seconds': [seconds for seconds, _, _, _ in results],
+        'worker': [worker for _, worker, _, _ in results],
+        'skipped': skipped,
+        'error': [error for _, _, error, _ in results],
+    })
+    timings.attrs['wall_seconds'] = wall_seconds
+    return timings
@@ -0,0 +1,204 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from chart_render import recording_outputs, output_settings
+
+# rcParams that do not change the files written
+_IGNORED_RC = ('backend', 'backend_fallback', 'interactive', 'webagg.port', 'webagg.address')
+
+
+def _update_digest(digest, obj):
+    """
+    Feeds the content of a plot input (frames, arrays, ProportionTables, dicts...) to `digest`.
+    """
+    digest.update(type(obj).__name__.encode('utf-8'))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        dtypes = obj.dtypes if isinstance(obj, pd.DataFrame) else [obj.dtype]
+        digest.update(repr(list(map(str, dtypes))).encode('utf-8'))
+        if isinstance(obj, pd.DataFrame):
+            digest.update(repr(list(obj.columns)).encode('utf-8'))
+        try:
+            digest.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+        except TypeError:
+            # Unhashable cells (e.g. lists): fall back to the pickled frame
+            digest.update(pickle.dumps(obj))
+    elif isinstance(obj, np.ndarray):
+        digest.update(f'{obj.dtype}{obj.shape}'.encode('utf-8'))
+        digest.update(np.ascontiguousarray(obj).tobytes() if obj.dtype != object else pickle.dumps(obj))
+    elif isinstance(obj, dict):
+        # Insertion order is kept: it is the drawing order of many charts
+        for key, value in obj.items():
+            _update_digest(digest, key)
+            _update_digest(digest, value)
+    elif isinstance(obj, (list, tuple)):
+        digest.update(str(len(obj)).encode('utf-8'))
+        for value in obj:
+            _update_digest(digest, value)
+    elif hasattr(obj, '__dict__') and not callable(obj):
+        # Result objects such as ProportionTable
+        _update_digest(digest, vars(obj))
+    else:
+        digest.update(repr(obj).encode('utf-8'))
+
+
+def data_fingerprint(*args, **kwargs):
+    """
+    SHA-256 of the arguments of a plot call. Equal data gives the same fingerprint,
+    wherever it was computed.
+    """
+    digest = hashlib.sha256()
+    _update_digest(digest, list(args))
+    _update_digest(digest, dict(sorted(kwargs.items())))
+    return digest.hexdigest()
+
+
+def function_name(plot_function):
+    """
+    'module.name' of a plot function; a functools.partial is named after the function it
+    wraps and other callable objects after their class.
+    """
+    while isinstance(plot_function, functools.partial):
+        plot_function = plot_function.func
+    if not hasattr(plot_function, '__qualname__'):
+        plot_function = type(plot_function)
+    return f'{plot_function.__module__}.{plot_function.__qualname__}'
+
+
+def function_fingerprint(plot_function):
+    """
+    SHA-256 of a plot function's identity: module, name and source code, so editing the
+    function invalidates its charts. The arguments bound by a functools.partial are part
+    of it.
+    """
+    if isinstance(plot_function, functools.partial):
+        parts = [function_fingerprint(plot_function.func),
+                 data_fingerprint(*plot_function.args, **plot_function.keywords)]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    # Callable objects are identified by their class
+    code = plot_function if hasattr(plot_function, '__code__') else type(plot_function)
+    try:
+        source = inspect.getsource(code)
+    except (OSError, TypeError):
+        source = repr(code.__code__.co_code) if hasattr(code, '__code__') else repr(code)
+    identity = [code.__module__, code.__qualname__, source]
+    return hashlib.sha256(json.dumps(identity).encode('utf-8')).hexdigest()
+
+
+def output_fingerprint():
+    """
+    SHA-256 of the style and output settings in effect: matplotlib rcParams and the
+    output profile and folder of `chart_render`.
+    """
+    params = sorted((key, repr(value)) for key, value in matplotlib.rcParams.items() if key not in _IGNORED_RC)
+    settings = sorted((key, repr(value)) for key, value in output_settings().items())
+    return hashlib.sha256(json.dumps([params, settings]).encode('utf-8')).hexdigest()
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Skips re-rendering charts whose inputs have not changed.
+
+    A chart is keyed on the fingerprints of the plot function, of its input data and of the
+    style and output settings (rcParams, output profile and folder). The manifest (a JSON
+    file) maps each key to the files the chart wrote and their SHA-256; a chart is skipped
+    when its key is in the manifest and all its files are still on disk with the recorded
+    content. The manifest also serves incremental report builds: `outputs()` lists every
+    chart file with its hash.
+
+    Charts that do not save a file (no filename passed to `finish_figure`) are always
+    rendered.
+
+    Parameters:
+    - manifest_path (str): Manifest file, created on the first render.
+      e.g. cache = RenderCache('report/render_manifest.json')
+           cache.render(reasons_for_not_receiving_vaccine, results_no_vacc)
+    """
+
+    def __init__(self, manifest_path='render_manifest.json'):
+        self.manifest_path = manifest_path
+        self.rendered = 0
+        self.skipped = 0
+        self.charts = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding='utf-8') as f:
+                self.charts = json.load(f)['charts']
+
+    def key(self, plot_function, args=(), kwargs=None):
+        """
+        Content address of a plot call.
+        """
+        parts = [function_fingerprint(plot_function), data_fingerprint(*args, **(kwargs or {})),
+                 output_fingerprint()]
+        return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+    def is_fresh(self, key):
+        """
+        True when the chart of `key` was rendered and its files are unchanged.
+        """
+        entry = self.charts.get(key)
+        if not entry or not entry['files']:
+            return False
+        return all(os.path.exists(path) and file_hash(path) == digest for path, digest in entry['files'].items())
+
+    def record(self, key, plot_function, files):
+        """
+        Stores the files written by the chart of `key` in the manifest. Entries of other
+        keys that pointed to the same files are dropped, since those files were overwritten.
+        """
+        files = {os.path.abspath(path): file_hash(path) for path in dict.fromkeys(files)}
+        self.charts = {other: entry for other, entry in self.charts.items()
+                       if other != key and not set(entry['files']) & set(files)}
+        self.charts[key] = {'function': function_name(plot_function), 'files': files}
+        self.save()
+
+    def render(self, plot_function, *args, **kwargs):
+        """
+        Calls plot_function(*args, **kwargs) unless its chart is already up to date.
+
+        Returns:
+        - bool: True if the chart was rendered, False if it was skipped.
+        """
+        key = self.key(plot_function, args, kwargs)
+        if self.is_fresh(key):
+            self.skipped += 1
+            return False
+
+        with recording_outputs() as files:
+            plot_function(*args, **kwargs)
+        self.record(key, plot_function, files)
+        self.rendered += 1
+        return True
+
+    def outputs(self):
+        """
+        Chart files of the manifest with their SHA-256 and the function that wrote them.
+
+        Returns:
+        - DataFrame: Columns file, sha256 and function.
+        """
+        rows = [(path, digest, entry['function'])
+                for entry in self.charts.values() for path, digest in entry['files'].items()]
+        return pd.DataFrame(rows, columns=['file', 'sha256', 'function'])
+
+    def save(self):
+        folder = os.path.dirname(os.path.abspath(self.manifest_path))
+        os.makedirs(folder, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'charts': self.charts}, f, indent=1)
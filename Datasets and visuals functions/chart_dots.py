@@ -0,0 +1,61 @@
+import numpy as np
+
+
+def dot_counts(percentages, n_dots=100):
+    """
+    Converts percentages into whole numbers of dots that add up to `n_dots`.
+
+    Each share is rounded to the nearest dot; the rounding difference goes to the
+    category with the most dots.
+
+    Parameters:
+    - percentages (array-like): Percentage of each category, in drawing order.
+    - n_dots (int): Number of dots of the grid, e.g. 100 for a 10x10 grid or 1000 for a
+      20x50 per-mille grid.
+
+    Returns:
+    - ndarray: Number of dots of each category.
+    """
+    percentages = np.nan_to_num(np.asarray(percentages, dtype=float))
+    counts = np.rint(percentages * n_dots / 100).astype(int)
+    counts[np.argmax(counts)] += n_dots - counts.sum()
+    return counts
+
+
+def draw_dot_grid(ax, counts, colors, n_rows=10, n_cols=10, size=100, edgecolor='white', linewidth=0.5):
+    """
+    Draws a dot grid on `ax` with a single scatter call.
+
+    Dots are filled row by row from the top left corner, category after category. The
+    coordinates and face colors of all dots are computed as arrays up front, so the panel
+    is one PathCollection whatever the grid size.
+
+    Parameters:
+    - ax (Axes): Panel to draw on.
+    - counts (array-like): Number of dots of each category (see `dot_counts`); they must
+      add up to n_rows * n_cols.
+    - colors (list): Color of each category, in the same order as `counts`.
+    - n_rows, n_cols (int): Grid shape, e.g. 10 x 10 or 20 x 50.
+    - size (float): Marker area in points^2, as `s` in `ax.scatter`.
+    - edgecolor, linewidth: Dot outline.
+
+    Returns:
+    - PathCollection: The dots.
+    """
+    counts = np.asarray(counts, dtype=int)
+    n_dots = n_rows * n_cols
+    if counts.sum() != n_dots:
+        raise ValueError(f'Dot counts add up to {counts.sum()}, expected {n_dots} ({n_rows}x{n_cols} grid).')
+
+    rows, cols = np.divmod(np.arange(n_dots), n_cols)
+    categories = np.repeat(np.arange(len(counts)), counts)
+    face_colors = np.asarray(colors, dtype=object)[categories]
+
+    dots = ax.scatter(cols, n_rows - rows - 1, c=list(face_colors), s=size,
+                      edgecolors=edgecolor, linewidth=linewidth)
+
+    ax.set_xlim(-0.5, n_cols - 0.5)
+    ax.set_ylim(-0.5, n_rows - 0.5)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    return dots
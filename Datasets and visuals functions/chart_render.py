@@ -0,0 +1,176 @@
+import os
+from contextlib import contextmanager
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+try:
+    from IPython.display import display
+except ImportError:
+    # Outside IPython, standalone figures are only written to files
+    display = None
+
+# Rendering mode and output settings shared by all plotting modules
+_settings = {'headless': False, 'profile': 'print', 'output_dir': None}
+
+# Savefig settings of each output profile; the format replaces the extension of the chart's file name
+OUTPUT_PROFILES = {
+    'draft': {'format': 'png', 'dpi': 72, 'bbox_inches': None},
+    'print': {'format': 'png', 'dpi': 300, 'bbox_inches': 'tight'},
+    'svg': {'format': 'svg', 'bbox_inches': 'tight'},
+    'pdf': {'format': 'pdf', 'bbox_inches': 'tight'},
+}
+
+# Lists collecting the files written by `finish_figure` (see `recording_outputs`)
+_recorders = []
+
+# Keyword arguments of plt.subplots that belong to the Figure rather than to the axes grid
+_FIGURE_KWARGS = ('figsize', 'dpi', 'facecolor', 'edgecolor', 'frameon', 'layout')
+
+
+def set_headless(enabled=True):
+    """
+    Switches the plotting functions to headless rendering, for batch jobs that write
+    charts to files without displaying them.
+
+    In headless mode figures are built with the object-oriented `Figure` API on their own
+    Agg canvas: they are never registered with pyplot, so no global figure list grows, and
+    each figure is released as soon as it is written. The pyplot backend is left alone,
+    so the figures already open in a notebook are kept (switching backends would close
+    them); worker processes of `chart_batch` select Agg themselves.
+
+    Parameters:
+    - enabled (bool): True for headless rendering, False to display charts again.
+    """
+    _settings['headless'] = enabled
+
+
+def is_headless():
+    return _settings['headless']
+
+
+def subplots(nrows=1, ncols=1, **kwargs):
+    """
+    Same call as `plt.subplots`; returns (fig, axes). In headless mode the figure is a
+    standalone `Figure` with its own Agg canvas.
+    """
+    if not _settings['headless']:
+        return plt.subplots(nrows, ncols, **kwargs)
+    return new_figure(nrows, ncols, **kwargs)
+
+
+def new_figure(nrows=1, ncols=1, **kwargs):
+    """
+    Same call as `plt.subplots`, always returning a standalone `Figure` with its own Agg
+    canvas. Such a figure is never shown or closed by pyplot, so it can be kept and redrawn
+    (see `chart_templates`).
+    """
+    fig = Figure(**{key: kwargs.pop(key) for key in _FIGURE_KWARGS if key in kwargs})
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots(nrows, ncols, **kwargs)
+
+
+def set_output(profile=None, output_dir=None):
+    """
+    Chooses how every plotting function writes its chart file.
+
+    Parameters:
+    - profile (str, optional): One of `OUTPUT_PROFILES`: 'draft' (72 dpi PNG, no tight
+      bounding box, for fast iterations), 'print' (300 dpi PNG, the default), 'svg' or
+      'pdf' (vector files for the final report). None keeps the current profile.
+    - output_dir (str, optional): Folder the charts are written to (created if needed).
+      None keeps the current folder; '' writes to the working directory again.
+    """
+    if profile is not None:
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"Unknown output profile '{profile}'. Choose from {list(OUTPUT_PROFILES)}.")
+        _settings['profile'] = profile
+    if output_dir is not None:
+        _settings['output_dir'] = output_dir or None
+
+
+def output_settings():
+    """
+    Current output profile name, its savefig settings and the output folder.
+    """
+    return {'profile': _settings['profile'], 'output_dir': _settings['output_dir'],
+            **OUTPUT_PROFILES[_settings['profile']]}
+
+
+def output_path(filename):
+    """
+    Path a chart named `filename` is written to under the current output settings,
+    e.g. 'charts/needing_healthcare.svg' for 'needing_healthcare.png' with the 'svg' profile.
+    """
+    profile = OUTPUT_PROFILES[_settings['profile']]
+    path = f"{os.path.splitext(filename)[0]}.{profile['format']}"
+    if _settings['output_dir']:
+        path = os.path.join(_settings['output_dir'], path)
+    return path
+
+
+def save_figure(fig, filename, **savefig_kwargs):
+    """
+    Writes `fig` with the current output profile (see `output_path`) and returns the path.
+    """
+    path = output_path(filename)
+    if _settings['output_dir']:
+        os.makedirs(_settings['output_dir'], exist_ok=True)
+    fig.savefig(path, **{**OUTPUT_PROFILES[_settings['profile']], **savefig_kwargs})
+    for files in _recorders:
+        files.append(path)
+    return path
+
+
+def display_figure(fig):
+    """
+    Shows a standalone figure (see `new_figure`) in the notebook without releasing it.
+    Nothing is shown when rendering headless or outside IPython.
+    """
+    if _settings['headless'] or display is None:
+        return
+    display(fig)
+
+
+def finish_figure(fig, filename=None, keep=False, **savefig_kwargs):
+    """
+    Writes `fig` to `filename` (when given) with the current output profile, displays it
+    unless rendering headless, and releases it.
+
+    Parameters:
+    - fig (Figure): Figure returned by `subplots` or `new_figure`.
+    - filename (str, optional): Chart file name, e.g. 'Reasons for not receiving vaccine.png'.
+      The extension and folder come from the output settings (see `output_path`).
+    - keep (bool): Keep the figure's artists after it is written and shown, for figures
+      that are redrawn (see `chart_templates`). The caller then releases the figure.
+    - savefig_kwargs: Passed on to `Figure.savefig`, over the profile's settings.
+    """
+    if filename is not None:
+        save_figure(fig, filename, **savefig_kwargs)
+
+    if _settings['headless'] or fig.canvas.manager is None:
+        # Standalone figure: pyplot does not know it, so it is displayed here
+        display_figure(fig)
+        if not keep:
+            # Drops the artists now rather than waiting for the garbage collector
+            fig.clear()
+        return
+
+    plt.show()
+    if not keep:
+        plt.close(fig)
+
+
+@contextmanager
+def recording_outputs():
+    """
+    Collects the files written by `finish_figure` while the block runs.
+    e.g. with recording_outputs() as files: plot_school_type_rate(school_type_rate)
+    """
+    files = []
+    _recorders.append(files)
+    try:
+        yield files
+    finally:
+        _recorders.pop()
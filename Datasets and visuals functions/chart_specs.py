@@ -0,0 +1,139 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from chart_render import subplots, finish_figure
+from survey_stats import percentage_matrix, result_groups
+
+# Styling shared by the stacked-bar charts, selected with `StackedBarSpec(layout=...)`
+STACKED_BAR_LAYOUTS = {
+    # Marriage, school type, difficulty and diarrhea treatment charts: groups top-down,
+    # legend below the bars
+    'wide': {
+        'figsize': (10, 4.5),
+        'tick_fontsize': 11,
+        'label_fontsize': 12,
+        'top_down': True,
+        'legend': {'loc': 'lower center', 'bbox_to_anchor': (0.5, -0.45), 'ncol': 2,
+                   'frameon': False, 'fontsize': 10},
+        'grid': True,
+        'percent_ticks': False,
+        'hide_spines': False,
+    },
+    # Yes/No charts (school attendance, deworming): legend above, % ticks, no top/right spines
+    'compact': {
+        'figsize': (8, 3),
+        'tick_fontsize': None,
+        'label_fontsize': None,
+        'top_down': False,
+        'legend': {'title': 'Response', 'loc': 'upper center', 'bbox_to_anchor': (0.5, 1.25),
+                   'ncol': 2, 'frameon': False},
+        'grid': False,
+        'percent_ticks': True,
+        'hide_spines': True,
+    },
+}
+
+
+class StackedBarSpec:
+    """
+    Declarative description of a 100% stacked bar chart with one bar per population group.
+    e.g. StackedBarSpec(['Married', 'Never Married'], ['#152745', '#a8c4e3'],
+                        filename='Marriage Among children.png')
+
+    Parameters:
+    - categories (list): Answers stacked, in stacking order.
+    - colors (list or dict): Color of each category (list in category order, or
+      category -> color).
+    - value_label (str): Label of the percentage axis.
+    - title (str, optional): Bold title written below the chart.
+    - filename (str, optional): Chart file name; None only displays the chart.
+    - groups (list, optional): Groups drawn, in order. None uses the groups of the results.
+    - layout (str): Key of `STACKED_BAR_LAYOUTS` ('wide' or 'compact').
+    - orientation (str): 'horizontal' (bars along x, the default) or 'vertical'.
+    - bar_width (float): Thickness of the bars.
+    - title_fontsize (int): Font size of `title`.
+    - group_label (str, optional): Title of the group axis, none by default,
+      e.g. survey_labels.variable_label('Intro_07_1').
+    """
+
+    def __init__(self, categories, colors, value_label='Percentage (%)', title=None, filename=None,
+                 groups=('Host community North', 'Refugees'), layout='wide', orientation='horizontal',
+                 bar_width=0.2, title_fontsize=12, group_label=None):
+        if layout not in STACKED_BAR_LAYOUTS:
+            raise ValueError(f"Unknown layout '{layout}'. Choose from {list(STACKED_BAR_LAYOUTS)}.")
+        if orientation not in ('horizontal', 'vertical'):
+            raise ValueError("orientation must be 'horizontal' or 'vertical'.")
+        self.categories = list(categories)
+        if isinstance(colors, dict):
+            colors = [colors[category] for category in self.categories]
+        if len(colors) != len(self.categories):
+            raise ValueError('One color is needed per category.')
+        self.colors = list(colors)
+        self.value_label = value_label
+        self.title = title
+        self.filename = filename
+        self.groups = None if groups is None else list(groups)
+        self.layout = layout
+        self.orientation = orientation
+        self.bar_width = bar_width
+        self.title_fontsize = title_fontsize
+        self.group_label = group_label
+
+
+def render_stacked_bars(spec, results):
+    """
+    Draws the stacked bar chart described by `spec`: each stack level is one `barh` (or
+    `bar`) call covering all groups, placed on the cumulative sum of the levels below it.
+
+    Parameters:
+    - spec (StackedBarSpec): Chart description.
+    - results (ProportionTable): Weighted proportions per group; categories missing from
+      it count as 0.
+    """
+    style = STACKED_BAR_LAYOUTS[spec.layout]
+    groups = result_groups(results) if spec.groups is None else spec.groups
+    data = percentage_matrix(results, groups, spec.categories)
+    horizontal = spec.orientation == 'horizontal'
+
+    fig, ax = subplots(figsize=style['figsize'])
+    positions = np.arange(len(groups))
+    # Where each stack level starts: cumulative sum of the levels before it
+    starts = np.cumsum(np.column_stack([np.zeros(len(groups)), data[:, :-1]]), axis=1)
+
+    for values, start, category, color in zip(data.T, starts.T, spec.categories, spec.colors):
+        if horizontal:
+            ax.barh(positions, values, left=start, color=color, label=category, height=spec.bar_width)
+        else:
+            ax.bar(positions, values, bottom=start, color=color, label=category, width=spec.bar_width)
+
+    group_axis, value_axis = (ax.yaxis, ax.xaxis) if horizontal else (ax.xaxis, ax.yaxis)
+    tick_kwargs = {} if style['tick_fontsize'] is None else {'fontsize': style['tick_fontsize']}
+    label_kwargs = {} if style['label_fontsize'] is None else {'fontsize': style['label_fontsize']}
+
+    group_axis.set_ticks(positions)
+    group_axis.set_ticklabels(groups, **tick_kwargs)
+    if spec.group_label:
+        group_axis.set_label_text(spec.group_label)
+    if style['top_down'] and horizontal:
+        ax.invert_yaxis()
+    value_axis.set_label_text(spec.value_label, **label_kwargs)
+    (ax.set_xlim if horizontal else ax.set_ylim)(0, 100)
+    if style['percent_ticks']:
+        value_axis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
+    if style['hide_spines']:
+        ax.spines['right'].set_visible(False)
+        ax.spines['top'].set_visible(False)
+
+    ax.legend(**style['legend'])
+    if style['grid']:
+        ax.set_facecolor('white')
+        fig.patch.set_facecolor('white')
+        value_axis.grid(True, linestyle='-', alpha=0.1)
+
+    if spec.title:
+        fig.tight_layout(rect=[0, 0.05, 1, 1])
+        fig.text(0.01, 0.03, spec.title, ha='left', va='bottom', fontsize=spec.title_fontsize, fontweight='bold')
+    else:
+        fig.tight_layout()
+
+    finish_figure(fig, spec.filename)
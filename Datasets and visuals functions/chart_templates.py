@@ -0,0 +1,122 @@
+import numpy as np
+import matplotlib.pyplot as plt
+
+from chart_render import new_figure, finish_figure
+
+
+class PairedBarTemplate:
+    """
+    Side-by-side horizontal bar charts of one indicator, one panel per population group
+    (the layout of the measles and pentavalent vaccination charts).
+
+    The figure skeleton (panels, titles, axis limits and formatters, grids, empty bars and
+    value labels) is built once. `render` only sets the bar widths, value labels, category
+    labels and the bottom title, and re-runs the layout only when the category labels
+    change, so drawing many indicators in a loop pays the setup and layout cost once.
+
+    Each chart has its own template (see `for_chart`), kept until `close` or `close_all`.
+
+    Parameters:
+    - n_categories (int): Number of bars per panel.
+    - groups (tuple): Panel titles, one per group.
+    - colors (tuple): Bar color of each panel.
+    - figsize (tuple): Figure size in inches.
+    """
+
+    # Templates of the plotting functions, keyed on the chart they draw
+    _charts = {}
+
+    def __init__(self, n_categories, groups=('Host community North', 'Refugees'),
+                 colors=('#aec7e8', '#1f77b4'), figsize=(10, 5)):
+        self.n_categories = n_categories
+        self.groups = list(groups)
+        self.fig, axes = new_figure(1, len(self.groups), figsize=figsize, sharey=True, squeeze=False)
+        self.axes = axes[0]
+        positions = np.arange(n_categories)
+
+        self.bars = []
+        self.labels = []
+        for ax, group, color in zip(self.axes, self.groups, colors):
+            self.bars.append(ax.barh(positions, np.zeros(n_categories), color=color))
+            ax.set_title(group)
+            ax.set_xlim(0, 100)
+            ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
+            ax.xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
+            ax.set_axisbelow(True)
+            # Value labels stay out of the layout so new values never require a new one
+            labels = [ax.annotate('', xy=(0, idx), xytext=(2, 0), textcoords='offset points',
+                                  va='center', ha='left', color='black', fontsize=9, fontweight='bold')
+                      for idx in positions]
+            for label in labels:
+                label.set_in_layout(False)
+            self.labels.append(labels)
+        self.axes[0].set_yticks(positions)
+        self.axes[0].invert_yaxis()
+
+        self.title = self.fig.text(0.01, 0.03, '', ha='left', va='bottom', fontsize=12, fontweight='bold')
+        self._layout_key = None
+
+    @classmethod
+    def for_chart(cls, chart, n_categories, **kwargs):
+        """
+        Template of the chart named `chart` (e.g. 'Measles Vaccination Status'), built on
+        first use and reused when that chart is drawn again. Two charts never share a
+        figure; a chart's template is rebuilt when its construction arguments change.
+        """
+        arguments = (n_categories, tuple(sorted(kwargs.items())))
+        template = cls._charts.get(chart)
+        if template is None or template._arguments != arguments:
+            if template is not None:
+                template.close()
+            template = cls(n_categories, **kwargs)
+            template._arguments = arguments
+            cls._charts[chart] = template
+        return template
+
+    @classmethod
+    def close_all(cls):
+        """
+        Releases the figures of every chart template, e.g. at the end of a report build.
+        """
+        for template in list(cls._charts.values()):
+            template.close()
+
+    def close(self):
+        """
+        Releases the template's figure and forgets the template.
+        """
+        self.fig.clear()
+        for chart in [chart for chart, template in self._charts.items() if template is self]:
+            del self._charts[chart]
+
+    def render(self, values, categories, title, filename=None, title_fontsize=12, **savefig_kwargs):
+        """
+        Draws one indicator: updates the artists, then saves (when `filename` is given) and
+        displays the figure through `chart_render.finish_figure`, which keeps it for the
+        next call.
+
+        Parameters:
+        - values (ndarray): Percentages, shape (groups, n_categories), in top-down order.
+        - categories (list): Category labels, top-down.
+        - title (str): Title written below the panels.
+        - filename (str, optional): Chart file name, written with the current output profile.
+        - title_fontsize (int): Font size of the bottom title.
+        - savefig_kwargs: Passed on to `chart_render.finish_figure`.
+        """
+        values = np.asarray(values, dtype=float)
+        for bars, labels, group_values in zip(self.bars, self.labels, values):
+            for idx, (bar, label, value) in enumerate(zip(bars, labels, group_values)):
+                bar.set_width(value)
+                label.xy = (value, idx)
+                label.set_text(f'{value:.1f}%')
+
+        self.title.set_text(title)
+        self.title.set_fontsize(title_fontsize)
+
+        layout_key = tuple(categories)
+        if layout_key != self._layout_key:
+            self.axes[0].set_yticklabels(categories)
+            self.fig.tight_layout(rect=[0, 0.05, 1, 1])
+            self._layout_key = layout_key
+
+        finish_figure(self.fig, filename, keep=True, **savefig_kwargs)
@@ -1,7 +1,9 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+from chart_render import subplots, finish_figure
+from chart_specs import StackedBarSpec, render_stacked_bars
+from chart_templates import PairedBarTemplate
+from survey_stats import percentage_matrix, result_groups
 
 def possession_of_immunization_cards(results):
     """
@@ -9,8 +11,8 @@ def possession_of_immunization_cards(results):
     among two groups: 'Refugees North' and 'Host community North'.
 
     Parameters:
-    - results (dict): A dictionary containing percentage values (as strings with '%') 
-                      for 'Yes -----> (%)' and 'No -----> (%)' responses for each group.
+    - results (ProportionTable): Weighted proportions from `weighted_category_proportions`
+                                with 'Yes' and 'No' categories for each group.
 
     The function processes the input data, reverses the order for top-down plotting, 
     and creates a grouped horizontal bar chart using customized colors and formatting.
@@ -27,14 +29,9 @@ def possession_of_immunization_cards(results):
     """
     # Process data
     group_labels = ['Refugees', 'Host community North']
-    values_yes = [
-        float(results['Refugees']['Yes -----> (%)'].replace('%', '')),
-        float(results['Host community North']['Yes -----> (%)'].replace('%', ''))
-    ]
-    values_no = [
-        float(results['Refugees']['No -----> (%)'].replace('%', '')),
-        float(results['Host community North']['No -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(results, group_labels, ['Yes', 'No'])
+    values_yes = values[:, 0]
+    values_no = values[:, 1]
 
     # Reverse order for top-down
     values_yes = values_yes[::-1]
@@ -45,7 +42,7 @@ def possession_of_immunization_cards(results):
     y = np.arange(len(group_labels))
     height = 0.35
 
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig, ax = subplots(figsize=(9, 5))
 
     # Custom premium colors
     deep_blue = '#1f77b4'    # Deep premium blue
@@ -83,8 +80,8 @@ def possession_of_immunization_cards(results):
                         fontsize=9,
                         fontweight='bold')
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
 
 def presented_immunization_cards(results_card_show):
     """
@@ -93,8 +90,8 @@ def presented_immunization_cards(results_card_show):
     'Host community North'.
 
     Parameters:
-    - results_card_show (dict): A dictionary containing percentage values (as strings with '%') 
-                                for 'Yes -----> (%)' and 'No -----> (%)' responses for each group.
+    - results_card_show (ProportionTable): Weighted proportions from `weighted_category_proportions`
+                                          with 'Yes' and 'No' categories for each group.
 
     The function processes the input data, reverses the order for top-down plotting, 
     and creates a grouped horizontal bar chart using customized colors and formatting.
@@ -111,14 +108,9 @@ def presented_immunization_cards(results_card_show):
     """
     # Process data
     group_labels = ['Refugees', 'Host community North']
-    values_yes = [
-        float(results_card_show['Refugees']['Yes -----> (%)'].replace('%', '')),
-        float(results_card_show['Host community North']['Yes -----> (%)'].replace('%', ''))
-    ]
-    values_no = [
-        float(results_card_show['Refugees']['No -----> (%)'].replace('%', '')),
-        float(results_card_show['Host community North']['No -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(results_card_show, group_labels, ['Yes', 'No'])
+    values_yes = values[:, 0]
+    values_no = values[:, 1]
 
     # Reverse order for top-down
     values_yes = values_yes[::-1]
@@ -129,7 +121,7 @@ def presented_immunization_cards(results_card_show):
     y = np.arange(len(group_labels))
     height = 0.35
 
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig, ax = subplots(figsize=(9, 5))
 
     # Custom premium colors
     deep_blue = '#1f77b4'    # Deep premium blue
@@ -167,8 +159,8 @@ def presented_immunization_cards(results_card_show):
                         fontsize=9,
                         fontweight='bold')
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
 
 def measles_vaccination_status(measles_vacc_coverage_rate1):
     """
@@ -176,8 +168,8 @@ def measles_vaccination_status(measles_vacc_coverage_rate1):
     for two groups: 'Host community North' and 'Refugees'.
 
     Parameters:
-    - measles_vacc_coverage_rate1 (dict): A dictionary containing percentage values (as strings with '%') 
-      for 'Vaccinated -----> (%)' and 'Not Vaccinated -----> (%)' under each group.
+    - measles_vacc_coverage_rate1 (ProportionTable): Weighted proportions with 'Vaccinated' and 
+      'Not Vaccinated' categories under each group.
 
     This function visualizes the proportion of vaccinated and not vaccinated individuals 
     per group using consistent color-coding and formatting. Values are annotated directly 
@@ -198,64 +190,11 @@ def measles_vaccination_status(measles_vacc_coverage_rate1):
     categories = ['Vaccinated', 'Not Vaccinated']
 
     # Extract values
-    host_values = [
-        float(measles_vacc_coverage_rate1['Host community North']['Vaccinated -----> (%)'].replace('%', '')),
-        float(measles_vacc_coverage_rate1['Host community North']['Not Vaccinated -----> (%)'].replace('%', '')),
-    ]
-    refugee_values = [
-        float(measles_vacc_coverage_rate1['Refugees']['Vaccinated -----> (%)'].replace('%', '')),
-        float(measles_vacc_coverage_rate1['Refugees']['Not Vaccinated -----> (%)'].replace('%', '')),
-    ]
+    values = percentage_matrix(measles_vacc_coverage_rate1, ['Host community North', 'Refugees'], categories)
 
-    # Reverse for top-down plotting
-    categories = categories[::-1]
-    host_values = host_values[::-1]
-    refugee_values = refugee_values[::-1]
-
-    # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(10, 5), sharey=True)
-
-    # Custom premium colors
-    color_host = '#aec7e8'    # soft light blue
-    color_refugee = '#1f77b4' # deep bold blue
-
-    # Host Community Plot
-    axes[0].barh(categories, host_values, color=color_host)
-    axes[0].set_title('Host community North')
-    axes[0].set_xlim(0, 100)
-    axes[0].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[0].invert_yaxis()
-    axes[0].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[0].set_axisbelow(True)
-
-    # Refugee Plot
-    axes[1].barh(categories, refugee_values, color=color_refugee)
-    axes[1].set_title('Refugees')
-    axes[1].set_xlim(0, 100)
-    axes[1].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[1].invert_yaxis()
-    axes[1].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[1].set_axisbelow(True)
-
-    # Add value labels at end of bars
-    for ax, values in zip(axes, [host_values, refugee_values]):
-        for idx, value in enumerate(values):
-            ax.annotate(f'{value:.1f}%',
-                        xy=(value, idx),
-                        xytext=(2, 0),
-                        textcoords='offset points',
-                        va='center',
-                        ha='left',
-                        color='black',
-                        fontsize=9,
-                        fontweight='bold')
-
-    # Common title at bottom
-    fig.text(0.01, 0.03, 'Measles Vaccination Status', ha='left', va='bottom', fontsize=12, fontweight='bold')
-
-    # Layout and show
-    plt.tight_layout(rect=[0, 0.05, 1, 1])
-    plt.show()
+    # Plot, categories top-down
+    template = PairedBarTemplate.for_chart('Measles Vaccination Status', len(categories))
+    template.render(values, categories, 'Measles Vaccination Status')
 
 def full_measles_vaccination_status(full_vacc_measles_rate):
     """
@@ -263,11 +202,10 @@ def full_measles_vaccination_status(full_vacc_measles_rate):
     coverage for 'Host community North' and 'Refugees'.
 
     Parameters:
-    - full_vacc_measles_rate (dict): A dictionary with nested dictionaries for each group containing 
-      percentage strings (with '%' symbols) for:
-        - 'Full_Vaccination -----> (%)'
-        - 'Incomplete Vaccination -----> (%)'
-        - 'Not Yet Vaccinated -----> (%)'
+    - full_vacc_measles_rate (ProportionTable): Weighted proportions for each group with the categories:
+        - 'Full_Vaccination'
+        - 'Incomplete Vaccination'
+        - 'Not Yet Vaccinated'
 
     The function visualizes these proportions as horizontal bars per group, displayed top-down in reverse order.
     Each bar is annotated with its value and color-coded for clarity.
@@ -287,65 +225,12 @@ def full_measles_vaccination_status(full_vacc_measles_rate):
     categories = ['Full_Vaccination', 'Not Vaccinated', 'Incomplete Vaccination']
 
     # Extract values
-    host_values = [
-        float(full_vacc_measles_rate['Host community North']['Full_Vaccination -----> (%)'].replace('%', '')),
-        float(full_vacc_measles_rate['Host community North']['Not Yet Vaccinated -----> (%)'].replace('%', '')),
-        float(full_vacc_measles_rate['Host community North']['Incomplete Vaccination -----> (%)'].replace('%', ''))
-    ]
-    refugee_values = [
-        float(full_vacc_measles_rate['Refugees']['Full_Vaccination -----> (%)'].replace('%', '')),
-        float(full_vacc_measles_rate['Refugees']['Not Yet Vaccinated -----> (%)'].replace('%', '')),
-        float(full_vacc_measles_rate['Refugees']['Incomplete Vaccination -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(full_vacc_measles_rate, ['Host community North', 'Refugees'],
+                               ['Full_Vaccination', 'Not Yet Vaccinated', 'Incomplete Vaccination'])
 
-    # Reverse for top-down plotting
-    categories = categories[::-1]
-    host_values = host_values[::-1]
-    refugee_values = refugee_values[::-1]
-
-    # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(10, 5), sharey=True)
-
-    # Custom premium colors
-    color_host = '#aec7e8'    # soft light blue
-    color_refugee = '#1f77b4' # deep bold blue
-
-    # Host Community Plot
-    axes[0].barh(categories, host_values, color=color_host)
-    axes[0].set_title('Host community North')
-    axes[0].set_xlim(0, 100)
-    axes[0].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[0].invert_yaxis()
-    axes[0].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[0].set_axisbelow(True)
-
-    # Refugee Plot
-    axes[1].barh(categories, refugee_values, color=color_refugee)
-    axes[1].set_title('Refugees')
-    axes[1].set_xlim(0, 100)
-    axes[1].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[1].invert_yaxis()
-    axes[1].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[1].set_axisbelow(True)
-
-    # Add value labels at end of bars
-    for ax, values in zip(axes, [host_values, refugee_values]):
-        for idx, value in enumerate(values):
-            ax.annotate(f'{value:.1f}%',
-                        xy=(value, idx),
-                        xytext=(2, 0),
-                        textcoords='offset points',
-                        va='center',
-                        ha='left',
-                        color='black',
-                        fontsize=9,
-                        fontweight='bold')
-
-    fig.text(0.01, 0.03, 'Full Measles Vaccination Status', ha='left', va='bottom', fontsize=12, fontweight='bold')
-
-    # Layout and show
-    plt.tight_layout(rect=[0, 0.05, 1, 1])
-    plt.show()
+    # Plot, categories top-down
+    template = PairedBarTemplate.for_chart('Full Measles Vaccination Status', len(categories))
+    template.render(values, categories, 'Full Measles Vaccination Status')
 
 def reasons_for_not_receiving_vaccine(results_no_vacc):
     """
@@ -353,15 +238,14 @@ def reasons_for_not_receiving_vaccine(results_no_vacc):
     among 'Host community North' and 'Refugees'.
 
     Parameters:
-    - results_no_vacc (dict): A nested dictionary containing percentage strings (with '%' symbols) 
-      for each barrier category under both groups:
-        - 'Do Not Trust Vaccine -----> (%)'
-        - 'Issue With Vaccine Staff -----> (%)'
-        - 'No Information About Immunization Schedules -----> (%)'
-        - 'No Time -----> (%)'
-        - 'Other Reasons -----> (%)'
-        - 'Service Unavailable -----> (%)'
-        - 'Transportation Issue -----> (%)'
+    - results_no_vacc (ProportionTable): Weighted proportions of each barrier category under both groups:
+        - 'Do Not Trust Vaccine'
+        - 'Issue With Vaccine Staff'
+        - 'No Information About Immunization Schedules'
+        - 'No Time'
+        - 'Other Reasons'
+        - 'Service Unavailable'
+        - 'Transportation Issue'
 
     Features:
     - Two subplots: Host Community and Refugees
@@ -378,24 +262,9 @@ def reasons_for_not_receiving_vaccine(results_no_vacc):
                   'No Time', 'Other Reasons', 'Service Unavailable', 'Transportation Issue']
 
     # Extract values
-    host_values = [
-        float(results_no_vacc['Host community North']['Do Not Trust Vaccine -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Host community North']['Issue With Vaccine Staff -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Host community North']['No Information About Immunization Schedules -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Host community North']['No Time -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Host community North']['Other Reasons -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Host community North']['Service Unavailable -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Host community North']['Transportation Issue -----> (%)'].replace('%', ''))
-    ]
-    refugee_values = [
-        float(results_no_vacc['Refugees']['Do Not Trust Vaccine -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Refugees']['Issue With Vaccine Staff -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Refugees']['No Information About Immunization Schedules -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Refugees']['No Time -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Refugees']['Other Reasons -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Refugees']['Service Unavailable -----> (%)'].replace('%', '')),
-        float(results_no_vacc['Refugees']['Transportation Issue -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(results_no_vacc, ['Host community North', 'Refugees'], categories)
+    host_values = values[0]
+    refugee_values = values[1]
 
     # Reverse for top-down plotting
     categories = categories[::-1]
@@ -403,7 +272,7 @@ def reasons_for_not_receiving_vaccine(results_no_vacc):
     refugee_values = refugee_values[::-1]
 
     # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(10, 5), sharey=True)
+    fig, axes = subplots(1, 2, figsize=(10, 5), sharey=True)
 
     # Custom premium colors
     color_host = '#aec7e8'    # soft light blue
@@ -443,9 +312,8 @@ def reasons_for_not_receiving_vaccine(results_no_vacc):
     fig.text(0.01, 0.03, 'Reasons for not receiving vaccine', ha='left', va='bottom', fontsize=10, fontweight='bold')
 
     # Layout and save
-    plt.tight_layout()
-    plt.savefig('Reasons for not receiving vaccine.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, 'Reasons for not receiving vaccine.png')
 
 def pentavalent_vaccination_status(pentavalent_vacc_coverage_rate):
     """
@@ -454,10 +322,8 @@ def pentavalent_vaccination_status(pentavalent_vacc_coverage_rate):
     'Not Vaccinated'.
 
     Parameters:
-    - pentavalent_vacc_coverage_rate (dict): A nested dictionary containing vaccination percentages 
-      for each group, where:
-        - 'Vaccinated -----> (%)' and 'Not Vaccinated -----> (%)' are the keys to be processed for 
-          'Host community North' and 'Refugees'.
+    - pentavalent_vacc_coverage_rate (ProportionTable): Weighted vaccination proportions for 
+      'Host community North' and 'Refugees', with 'Vaccinated' and 'Not Vaccinated' categories.
 
     Features:
     - Two subplots: Host Community and Refugees
@@ -473,63 +339,12 @@ def pentavalent_vaccination_status(pentavalent_vacc_coverage_rate):
     categories = ['Vaccinated', 'Not Vaccinated']
 
     # Extract values
-    host_values = [
-        float(pentavalent_vacc_coverage_rate['Host community North']['Vaccinated -----> (%)'].replace('%', '')),
-        float(pentavalent_vacc_coverage_rate['Host community North']['Not Vaccinated -----> (%)'].replace('%', '')),
-    ]
-    refugee_values = [
-        float(pentavalent_vacc_coverage_rate['Refugees']['Vaccinated -----> (%)'].replace('%', '')),
-        float(pentavalent_vacc_coverage_rate['Refugees']['Not Vaccinated -----> (%)'].replace('%', '')),
-    ]
-
-    # Reverse for top-down plotting
-    categories = categories[::-1]
-    host_values = host_values[::-1]
-    refugee_values = refugee_values[::-1]
-
-    # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(10, 5), sharey=True)
-
-    # Custom premium colors
-    color_host = '#aec7e8'    # soft light blue
-    color_refugee = '#1f77b4' # deep bold blue
-
-    # Host Community Plot
-    axes[0].barh(categories, host_values, color=color_host)
-    axes[0].set_title('Host community North')
-    axes[0].set_xlim(0, 100)
-    axes[0].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[0].invert_yaxis()
-    axes[0].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[0].set_axisbelow(True)
-
-    # Refugee Plot
-    axes[1].barh(categories, refugee_values, color=color_refugee)
-    axes[1].set_title('Refugees')
-    axes[1].set_xlim(0, 100)
-    axes[1].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[1].invert_yaxis()
-    axes[1].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[1].set_axisbelow(True)
+    values = percentage_matrix(pentavalent_vacc_coverage_rate, ['Host community North', 'Refugees'], categories)
 
-    # Add value labels at end of bars
-    for ax, values in zip(axes, [host_values, refugee_values]):
-        for idx, value in enumerate(values):
-            ax.annotate(f'{value:.1f}%',
-                        xy=(value, idx),
-                        xytext=(2, 0),
-                        textcoords='offset points',
-                        va='center',
-                        ha='left',
-                        color='black',
-                        fontsize=9,
-                        fontweight='bold')
-
-    # Layout and save
-    fig.text(0.01, 0.03, 'Pentavalent Vaccination Status', ha='left', va='bottom', fontsize=12, fontweight='bold')
-    plt.tight_layout(rect=[0, 0.05, 1, 1])  # Leaves space at bottom
-    plt.savefig('Pentavalent Vaccination Status.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    # Plot, categories top-down
+    template = PairedBarTemplate.for_chart('Pentavalent Vaccination Status', len(categories))
+    template.render(values, categories, 'Pentavalent Vaccination Status',
+                    'Pentavalent Vaccination Status.png')
 
 def full_pentavalent_vaccination_status(pentavalent_vacc_rate):
     """
@@ -537,10 +352,8 @@ def full_pentavalent_vaccination_status(pentavalent_vacc_rate):
     (Four Doses vs. Three Doses) for 'Host community North' and 'Refugees'.
 
     Parameters:
-    - pentavalent_vacc_rate (dict): A nested dictionary containing vaccination percentages for each 
-      group, where:
-        - 'Four Doses -----> (%)' and 'Three Doses -----> (%)' are the keys to be processed for 
-          'Host community North' and 'Refugees'.
+    - pentavalent_vacc_rate (ProportionTable): Weighted vaccination proportions for 
+      'Host community North' and 'Refugees', with 'Four Doses' and 'Three Doses' categories.
 
     Features:
     - Two subplots: Host Community and Refugees
@@ -556,63 +369,13 @@ def full_pentavalent_vaccination_status(pentavalent_vacc_rate):
     categories = ['Four Doses', 'Three Doses']
 
     # Extract values
-    host_values = [
-        float(pentavalent_vacc_rate['Host community North']['Four Doses -----> (%)'].replace('%', '')),
-        float(pentavalent_vacc_rate['Host community North']['Three Doses -----> (%)'].replace('%', '')),
-    ]
-    refugee_values = [
-        float(pentavalent_vacc_rate['Refugees']['Four Doses -----> (%)'].replace('%', '')),
-        float(pentavalent_vacc_rate['Refugees']['Three Doses -----> (%)'].replace('%', '')),
-    ]
-
-    # Reverse for top-down plotting
-    categories = categories[::-1]
-    host_values = host_values[::-1]
-    refugee_values = refugee_values[::-1]
-
-    # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(10, 5), sharey=True)
-
-    # Custom premium colors
-    color_host = '#aec7e8'    # soft light blue
-    color_refugee = '#1f77b4' # deep bold blue
-
-    # Host Community Plot
-    axes[0].barh(categories, host_values, color=color_host)
-    axes[0].set_title('Host community North')
-    axes[0].set_xlim(0, 100)
-    axes[0].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[0].invert_yaxis()
-    axes[0].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[0].set_axisbelow(True)
+    values = percentage_matrix(pentavalent_vacc_rate, ['Host community North', 'Refugees'], categories)
 
-    # Refugee Plot
-    axes[1].barh(categories, refugee_values, color=color_refugee)
-    axes[1].set_title('Refugees')
-    axes[1].set_xlim(0, 100)
-    axes[1].xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    axes[1].invert_yaxis()
-    axes[1].xaxis.grid(True, linestyle='--', linewidth=0.5, color='gray')
-    axes[1].set_axisbelow(True)
+    # Plot, categories top-down
+    template = PairedBarTemplate.for_chart('Full Pentavalent Vaccination Status', len(categories))
+    template.render(values, categories, 'Full Pentavalent Vaccination Status',
+                    'Full Pentavalent Vaccination Status.png', title_fontsize=10)
 
-    # Add value labels at end of bars
-    for ax, values in zip(axes, [host_values, refugee_values]):
-        for idx, value in enumerate(values):
-            ax.annotate(f'{value:.1f}%',
-                        xy=(value, idx),
-                        xytext=(2, 0),
-                        textcoords='offset points',
-                        va='center',
-                        ha='left',
-                        color='black',
-                        fontsize=9,
-                        fontweight='bold')
-
-    # Layout and save
-    fig.text(0.01, 0.03, 'Full Pentavalent Vaccination Status', ha='left', va='bottom', fontsize=10, fontweight='bold')
-    plt.tight_layout(rect=[0, 0.05, 1, 1])  # Leaves space at bottom
-    plt.savefig('Full Pentavalent Vaccination Status.png', dpi=300, bbox_inches='tight')
-    plt.show()
 
 
 
@@ -622,9 +385,8 @@ def vitamin_a_supplementation(vitamin_a_coverage):
     ('Supplemented' vs. 'Not Supplemented') for 'Refugees North' and 'Host community North'.
 
     Parameters:
-    - vitamin_a_coverage (dict): A nested dictionary containing Vitamin A supplementation percentages for 
-      'Refugees North' and 'Host community North', where:
-        - 'Supplemented -----> (%)' and 'Not Supplemented -----> (%)' are the keys to be processed.
+    - vitamin_a_coverage (ProportionTable): Weighted Vitamin A supplementation proportions for 
+      'Refugees' and 'Host community North', with 'Supplemented' and 'Not Supplemented' categories.
 
     Features:
     - Two bars for each group, displaying 'Supplemented' vs. 'Not Supplemented' percentages.
@@ -637,14 +399,9 @@ def vitamin_a_supplementation(vitamin_a_coverage):
     """
     # Process data
     group_labels = ['Refugees', 'Host community North']
-    values_yes = [
-        float(vitamin_a_coverage['Refugees']['Supplemented -----> (%)'].replace('%', '')),
-        float(vitamin_a_coverage['Host community North']['Supplemented -----> (%)'].replace('%', ''))
-    ]
-    values_no = [
-        float(vitamin_a_coverage['Refugees']['Not Supplemented -----> (%)'].replace('%', '')),
-        float(vitamin_a_coverage['Host community North']['Not Supplemented -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(vitamin_a_coverage, group_labels, ['Supplemented', 'Not Supplemented'])
+    values_yes = values[:, 0]
+    values_no = values[:, 1]
 
     # Reverse order for top-down
     values_yes = values_yes[::-1]
@@ -655,7 +412,7 @@ def vitamin_a_supplementation(vitamin_a_coverage):
     y = np.arange(len(group_labels))
     height = 0.35
 
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig, ax = subplots(figsize=(9, 5))
 
     # Custom premium colors
     deep_blue = '#1f77b4'    # Deep premium blue
@@ -695,12 +452,20 @@ def vitamin_a_supplementation(vitamin_a_coverage):
                         fontweight='bold')
 
     # Layout and save
-    plt.tight_layout()
-    plt.savefig('Vitamin A Supplementation.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, 'Vitamin A Supplementation.png')
+
 
 
 
+DEWORMED_CHART = StackedBarSpec(
+    ['No', 'Yes'],
+    ['#1f77b4', '#aec7e8'],  # No = dark blue, Yes = light blue
+    value_label='% of Dewormed Children in the Past Six Months',
+    filename='Dewormed Children in the Past Six Months.png',
+    groups=None,
+    layout='compact'
+)
 
 def dewormed_children_coverage(GI_coverage_rate):
     """
@@ -708,9 +473,9 @@ def dewormed_children_coverage(GI_coverage_rate):
     in different groups ('Yes' vs. 'No') for each group in the GI_coverage_rate dictionary.
 
     Parameters:
-    - GI_coverage_rate (dict): A dictionary where keys are group names (e.g., regions), 
-      and values are dictionaries with keys 'No -----> (%)' and 'Yes -----> (%)', representing 
-      the percentage of children not dewormed and dewormed in the past six months, respectively.
+    - GI_coverage_rate (ProportionTable): Weighted proportions per group (e.g., regions) with 
+      'No' and 'Yes' categories, representing the children not dewormed and dewormed in the 
+      past six months, respectively.
 
     Features:
     - Stacked bars to show the percentage of 'No' vs. 'Yes' for each group.
@@ -719,48 +484,8 @@ def dewormed_children_coverage(GI_coverage_rate):
 
     No return value. Displays and saves the plot as 'Dewormed Children in the Past Six Months.png'.
     """
-    # Prepare data
-    groups = list(GI_coverage_rate.keys())
-    categories = ['No -----> (%)', 'Yes -----> (%)']
+    render_stacked_bars(DEWORMED_CHART, GI_coverage_rate)
 
-    data = []
-    for group in groups:
-        values = [float(GI_coverage_rate[group][cat].replace('%', '')) for cat in categories]
-        data.append(values)
-
-    # Setup plot
-    bar_height = 0.2
-    y_pos = np.arange(len(groups))
-    fig, ax = plt.subplots(figsize=(8, 3))
-
-    # Colors
-    colors = ['#1f77b4', '#aec7e8']  # No = dark blue, Yes = light blue
-
-    # Plot stacked bars
-    left = np.zeros(len(groups))
-    for idx, category in enumerate(categories):
-        values = [data[group_idx][idx] for group_idx in range(len(groups))]
-        label = 'No' if 'No' in category else 'Yes'
-        ax.barh(y_pos, values, left=left, height=bar_height, label=label, color=colors[idx])
-        left += values
-
-    # Decorate
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups)
-    ax.set_xlim(0, 100)
-    ax.set_xlabel('% of Dewormed Children in the Past Six Months')
-    ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    ax.spines['right'].set_visible(False)
-    ax.spines['top'].set_visible(False)
-
-    # Legend
-    ax.legend(title='Response', loc='upper center', bbox_to_anchor=(0.5, 1.25),
-              ncol=2, frameon=False)
-
-    # Layout and save
-    plt.tight_layout()
-    plt.savefig('Dewormed Children in the Past Six Months.png', dpi=300, bbox_inches='tight')
-    plt.show()
 
 
 
@@ -770,9 +495,8 @@ def reported_diarrhea_cases(health_issue_rate):
     cases ('Yes' vs. 'No') in different groups (e.g., regions) based on the provided data.
 
     Parameters:
-    - health_issue_rate (dict): A dictionary where keys are group names (e.g., regions), 
-      and values are dictionaries with keys 'No -----> (%)' and 'Yes -----> (%)', representing 
-      the percentage of children with reported diarrhea cases ('No' and 'Yes').
+    - health_issue_rate (ProportionTable): Weighted proportions per group (e.g., regions) with 
+      'No' and 'Yes' categories for children with reported diarrhea cases.
 
     Features:
     - Stacked bars to show the percentage of 'No' vs. 'Yes' for each group.
@@ -781,18 +505,14 @@ def reported_diarrhea_cases(health_issue_rate):
     No return value. Displays and saves the plot as 'Reported Diarrhea Cases Among Under-5 Children Past 2 Weeks.png'.
     """
     # Prepare data
-    groups = list(health_issue_rate.keys())
-    categories = ['No -----> (%)', 'Yes -----> (%)']
-
-    data = []
-    for group in groups:
-        values = [float(health_issue_rate[group][cat].replace('%', '')) for cat in categories]
-        data.append(values)
+    groups = result_groups(health_issue_rate)
+    categories = ['No', 'Yes']
+    data = percentage_matrix(health_issue_rate, groups, categories)
 
     # Setup plot
     bar_height = 0.2
     y_pos = np.arange(len(groups))
-    fig, ax = plt.subplots(figsize=(8, 3))
+    fig, ax = subplots(figsize=(8, 3))
 
     # Colors
     colors = ['#1f77b4', '#aec7e8']  # No = dark blue, Yes = light blue
@@ -800,9 +520,8 @@ def reported_diarrhea_cases(health_issue_rate):
     # Plot stacked bars
     left = np.zeros(len(groups))
     for idx, category in enumerate(categories):
-        values = [data[group_idx][idx] for group_idx in range(len(groups))]
-        label = 'No' if 'No' in category else 'Yes'
-        ax.barh(y_pos, values, left=left, height=bar_height, label=label, color=colors[idx])
+        values = data[:, idx]
+        ax.barh(y_pos, values, left=left, height=bar_height, label=category, color=colors[idx])
         left += values
 
     # Decorate
@@ -819,22 +538,34 @@ def reported_diarrhea_cases(health_issue_rate):
               ncol=2, frameon=False)
 
     # Layout and save
-    plt.tight_layout()
-    plt.savefig('Reported Diarrhea Cases Among Under-5 Children Past 2 Weeks.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, 'Reported Diarrhea Cases Among Under-5 Children Past 2 Weeks.png')
 
 
 
 
+DIARRHEA_TREATMENT_CHART = StackedBarSpec(
+    ['Partial Recommended Treatment', 'Home Remedy', 'No Treatment', 'Medical Intervention Only',
+     'Unknown Treatment'],
+    {
+        'Partial Recommended Treatment': '#152745',  # Dark navy blue
+        'Home Remedy': '#0066b3',                    # Blue
+        'No Treatment': '#a8c4e3',                   # Light blue
+        'Medical Intervention Only': '#00a89c',      # Same teal
+        'Unknown Treatment': '#7cd2c2'               # Light teal (different from medical intervention)
+    },
+    value_label='Treatment approach for the Diarrhea by %',
+    filename='Treatment Approaches for Under-5 Children with Diarrhea.png'
+)
+
 def treatment_approaches_for_diarrhea(diarrhea_treatment):
     """
     Creates a horizontal stacked bar chart to visualize the treatment approaches for diarrhea 
     among two groups (e.g., Host community and Refugees) based on the provided data.
 
     Parameters:
-    - diarrhea_treatment (dict): A dictionary where keys are group names (e.g., 'Host community North', 'Refugees'),
-      and values are dictionaries with keys representing treatment categories ('Partial Recommended Treatment', 'Home Remedy', etc.),
-      and the corresponding percentage values for each category.
+    - diarrhea_treatment (ProportionTable): Weighted proportions for each group (e.g., 'Host community North', 'Refugees')
+      over the treatment categories ('Partial Recommended Treatment', 'Home Remedy', etc.).
 
     Features:
     - Stacked bars for each group, with color-coded categories.
@@ -842,71 +573,4 @@ def treatment_approaches_for_diarrhea(diarrhea_treatment):
 
     No return value. Displays and saves the plot as 'Treatment Approaches for Under-5 Children with Diarrhea.png'.
     """
-    
-    # Categories in order you want
-    categories = [
-        'Partial Recommended Treatment',
-        'Home Remedy',
-        'No Treatment',
-        'Medical Intervention Only',
-        'Unknown Treatment'
-    ]
-
-    # Color mapping
-    colors = {
-        'Partial Recommended Treatment': '#152745',  # Dark navy blue
-        'Home Remedy': '#0066b3',                    # Blue
-        'No Treatment': '#a8c4e3',                   # Light blue
-        'Medical Intervention Only': '#00a89c',      # Same teal
-        'Unknown Treatment': '#7cd2c2'               # Light teal (different from medical intervention)
-    }
-
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in diarrhea_treatment[group]:
-                val = float(diarrhea_treatment[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Treatment approach for the Diarrhea by %', fontsize=12)
-    ax.set_xlim(0, 100)
-
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.savefig('Treatment Approaches for Under-5 Children with Diarrhea.png', dpi=300, bbox_inches='tight')
-    plt.show()
-
+    render_stacked_bars(DIARRHEA_TREATMENT_CHART, diarrhea_treatment)
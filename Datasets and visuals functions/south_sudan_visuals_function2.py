@@ -1,7 +1,10 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
 import matplotlib.pyplot as plt
+from chart_render import subplots, finish_figure
+from chart_specs import StackedBarSpec, render_stacked_bars
+from chart_dots import dot_counts, draw_dot_grid
+from survey_stats import percentage_matrix, result_groups
 
 def plot_pregnancy_rate_among_children(pregnancy_rate_among_children):
     """
@@ -9,7 +12,7 @@ def plot_pregnancy_rate_among_children(pregnancy_rate_among_children):
     between Host community North and Refugees.
 
     Parameters:
-        pregnancy_rate_among_children (dict): Nested dictionary with percentage strings for 'Yes' and 'No'.
+        pregnancy_rate_among_children (ProportionTable): Weighted proportions with 'Yes' and 'No' categories.
     """
     
 
@@ -17,18 +20,12 @@ def plot_pregnancy_rate_among_children(pregnancy_rate_among_children):
     categories = ['No', 'Yes'][::-1]
 
     # Extract and reverse values
-    host_values = [
-        float(pregnancy_rate_among_children['Host community North']['No -----> (%)'].replace('%', '')),
-        float(pregnancy_rate_among_children['Host community North']['Yes -----> (%)'].replace('%', '')),
-    ][::-1]
-
-    refugee_values = [
-        float(pregnancy_rate_among_children['Refugees']['No -----> (%)'].replace('%', '')),
-        float(pregnancy_rate_among_children['Refugees']['Yes -----> (%)'].replace('%', '')),
-    ][::-1]
+    values = percentage_matrix(pregnancy_rate_among_children, ['Host community North', 'Refugees'], ['No', 'Yes'])
+    host_values = values[0][::-1]
+    refugee_values = values[1][::-1]
 
     # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(12, 5), sharey=True)
+    fig, axes = subplots(1, 2, figsize=(12, 5), sharey=True)
 
     # Colors
     color_host = '#aec7e8'    # soft light blue
@@ -65,8 +62,17 @@ def plot_pregnancy_rate_among_children(pregnancy_rate_among_children):
                         fontsize=9,
                         fontweight='bold')
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
+
+# Marriage status colors shared by the three marriage charts
+MARRIAGE_COLORS = {
+    'Married': '#152745',
+    'Never Married': '#a8c4e3'
+}
+
+CHILDREN_MARRIAGE_CHART = StackedBarSpec(['Married', 'Never Married'], MARRIAGE_COLORS,
+                                         filename='Marriage Among children.png')
 
 def plot_children_marriage_rate(children_marriage_rate):
     """
@@ -74,51 +80,14 @@ def plot_children_marriage_rate(children_marriage_rate):
     in Host community North and Refugee groups.
 
     Parameters:
-        children_marriage_rate (dict): Nested dictionary containing percentages for 'Married' and 'Never Married'.
+        children_marriage_rate (ProportionTable): Weighted proportions including 'Married' and 'Never Married'.
     """
+    render_stacked_bars(CHILDREN_MARRIAGE_CHART, children_marriage_rate)
 
-    # Categories and colors
-    categories = ['Married', 'Never Married']
-    colors = {
-        'Married': '#152745',
-        'Never Married': '#a8c4e3'
-    }
 
-    groups = ['Host community North', 'Refugees']
-    group_data = {group: [] for group in groups}
-
-    # Extract data
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            val = float(children_marriage_rate[group].get(key, '0').replace('%', ''))
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    plt.tight_layout()
-    plt.savefig('Marriage Among children.png', dpi=300, bbox_inches='tight')
-    plt.show()
+FEMALE_CHILDREN_MARRIAGE_CHART = StackedBarSpec(['Married', 'Never Married'], MARRIAGE_COLORS,
+                                                title='Female children marriage rate',
+                                                filename='1marriage among females.png')
 
 def plot_female_children_marriage_rate(f_children_marriage_rate):
     """
@@ -126,54 +95,14 @@ def plot_female_children_marriage_rate(f_children_marriage_rate):
     in Host community North and Refugee groups.
 
     Parameters:
-        f_children_marriage_rate (dict): Nested dictionary containing percentages for 'Married' and 'Never Married'.
+        f_children_marriage_rate (ProportionTable): Weighted proportions including 'Married' and 'Never Married'.
     """
+    render_stacked_bars(FEMALE_CHILDREN_MARRIAGE_CHART, f_children_marriage_rate)
 
-    # Categories and their colors
-    categories = ['Married', 'Never Married']
-    colors = {
-        'Married': '#152745',
-        'Never Married': '#a8c4e3'
-    }
-
-    groups = ['Host community North', 'Refugees']
-    group_data = {group: [] for group in groups}
-
-    # Extract data
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            val = float(f_children_marriage_rate[group].get(key, '0').replace('%', ''))
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Additional label
-    plt.tight_layout(rect=[0, 0.05, 1, 1])
-    fig.text(0.01, 0.03, 'Female children marriage rate', ha='left', va='bottom', fontsize=12, fontweight='bold')
 
-    plt.savefig('1marriage among females.png', dpi=300, bbox_inches='tight')
-    plt.show()
+MALE_CHILDREN_MARRIAGE_CHART = StackedBarSpec(['Married', 'Never Married'], MARRIAGE_COLORS,
+                                              title='Male children marriage rate',
+                                              filename='1marriage among males.png')
 
 def plot_male_children_marriage_rate(m_children_marriage_rate):
     """
@@ -181,60 +110,17 @@ def plot_male_children_marriage_rate(m_children_marriage_rate):
     in Host community North and Refugee groups.
 
     Parameters:
-        m_children_marriage_rate (dict): Nested dictionary with percentages for 'Married' and 'Never Married'.
+        m_children_marriage_rate (ProportionTable): Weighted proportions including 'Married' and 'Never Married'.
     """
-    # Categories and colors
-    categories = ['Married', 'Never Married']
-    colors = {
-        'Married': '#152745',
-        'Never Married': '#a8c4e3'
-    }
-
-    groups = ['Host community North', 'Refugees']
-    group_data = {group: [] for group in groups}
-
-    # Extract data
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            val = float(m_children_marriage_rate[group].get(key, '0').replace('%', ''))
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Add annotation
-    plt.tight_layout(rect=[0, 0.05, 1, 1])
-    fig.text(0.01, 0.03, 'Male children marriage rate', ha='left', va='bottom', fontsize=12, fontweight='bold')
+    render_stacked_bars(MALE_CHILDREN_MARRIAGE_CHART, m_children_marriage_rate)
 
-    plt.savefig('1marriage among males.png', dpi=300, bbox_inches='tight')
-    plt.show()
 
 def plot_pre_school_attendance_dots(standard_pre_school_rate):
     """
     Plots a 10x10 dot grid for each group showing standard pre-school attendance rate.
 
     Parameters:
-        standard_pre_school_rate (dict): Dictionary with 'Yes' and 'No' percentages for each group.
+        standard_pre_school_rate (ProportionTable): Weighted 'Yes' and 'No' proportions for each group.
     """
     # Colors
     colors = {
@@ -248,33 +134,20 @@ def plot_pre_school_attendance_dots(standard_pre_school_rate):
     groups = ['Host community North', 'Refugees']
 
     # Build figure
-    fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+    fig, axes = subplots(1, 2, figsize=(12, 6))
     fig.patch.set_facecolor(background_color)
 
+    yes_rates = percentage_matrix(standard_pre_school_rate, groups, ['Yes'])[:, 0]
+
     for idx, group in enumerate(groups):
         ax = axes[idx]
         ax.set_facecolor(background_color)
 
         # Extract values
-        yes_pct = float(standard_pre_school_rate[group]['Yes -----> (%)'].replace('%', ''))
-        no_pct = float(standard_pre_school_rate[group]['No -----> (%)'].replace('%', ''))
-
-        yes_dots = int(round(yes_pct))
-        no_dots = 100 - yes_dots
-
-        # Create dot data
-        data = ['Yes'] * yes_dots + ['No'] * no_dots
-        data = np.array(data).reshape((n_rows, n_cols))
+        yes_pct = yes_rates[idx]
 
-        for i in range(n_rows):
-            for j in range(n_cols):
-                color = colors[data[i, j]]
-                ax.scatter(j, n_rows - i - 1, color=color, s=100, edgecolors='white', linewidth=0.5)
-
-        ax.set_xlim(-0.5, n_cols - 0.5)
-        ax.set_ylim(-0.5, n_rows - 0.5)
-        ax.set_aspect('equal')
-        ax.axis('off')
+        counts = dot_counts([yes_pct, 100 - yes_pct], n_rows * n_cols)
+        draw_dot_grid(ax, counts, [colors['Yes'], colors['No']], n_rows, n_cols)
         ax.set_title(group, fontsize=14, weight='bold', color='white')
 
     # Title and legend
@@ -286,9 +159,8 @@ def plot_pre_school_attendance_dots(standard_pre_school_rate):
     ]
     fig.legend(custom_lines, legend_labels, loc='lower center', ncol=2, frameon=False, fontsize=12, labelcolor='white')
 
-    plt.tight_layout(rect=[0, 0.05, 1, 0.95])
-    plt.savefig('pre_school_attendance.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95])
+    finish_figure(fig, 'pre_school_attendance.png')
 
 
 def plot_extended_pre_school_attendance_dots(fds_pre_school_rate):
@@ -297,7 +169,7 @@ def plot_extended_pre_school_attendance_dots(fds_pre_school_rate):
     for each group in the provided data.
 
     Parameters:
-        fds_pre_school_rate (dict): Dictionary with 'Yes' and 'No' percentages for each group.
+        fds_pre_school_rate (ProportionTable): Weighted 'Yes' and 'No' proportions for each group.
     """
 
     # Colors
@@ -312,33 +184,20 @@ def plot_extended_pre_school_attendance_dots(fds_pre_school_rate):
     groups = ['Host community North', 'Refugees']
 
     # Build figure
-    fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+    fig, axes = subplots(1, 2, figsize=(12, 6))
     fig.patch.set_facecolor(background_color)
 
+    yes_rates = percentage_matrix(fds_pre_school_rate, groups, ['Yes'])[:, 0]
+
     for idx, group in enumerate(groups):
         ax = axes[idx]
         ax.set_facecolor(background_color)
 
         # Extract values
-        yes_pct = float(fds_pre_school_rate[group]['Yes -----> (%)'].replace('%', ''))
-        no_pct = float(fds_pre_school_rate[group]['No -----> (%)'].replace('%', ''))
+        yes_pct = yes_rates[idx]
 
-        yes_dots = int(round(yes_pct))
-        no_dots = 100 - yes_dots
-
-        # Create grid
-        data = ['Yes'] * yes_dots + ['No'] * no_dots
-        data = np.array(data).reshape((n_rows, n_cols))
-
-        for i in range(n_rows):
-            for j in range(n_cols):
-                color = colors[data[i, j]]
-                ax.scatter(j, n_rows - i - 1, color=color, s=100, edgecolors='white', linewidth=0.5)
-
-        ax.set_xlim(-0.5, n_cols - 0.5)
-        ax.set_ylim(-0.5, n_rows - 0.5)
-        ax.set_aspect('equal')
-        ax.axis('off')
+        counts = dot_counts([yes_pct, 100 - yes_pct], n_rows * n_cols)
+        draw_dot_grid(ax, counts, [colors['Yes'], colors['No']], n_rows, n_cols)
         ax.set_title(group, fontsize=14, weight='bold', color='white')
 
     # Title and legend
@@ -350,9 +209,19 @@ def plot_extended_pre_school_attendance_dots(fds_pre_school_rate):
     ]
     fig.legend(custom_lines, legend_labels, loc='lower center', ncol=2, frameon=False, fontsize=12, labelcolor='white')
 
-    plt.tight_layout(rect=[0, 0.05, 1, 0.95])
-    plt.savefig('extendend_attendance.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95])
+    finish_figure(fig, 'extendend_attendance.png')
+
+SCHOOL_ATTENDANCE_CHART = StackedBarSpec(
+    ['No', 'Yes'],
+    ['#1f77b4', '#aec7e8'],  # No = dark blue, Yes = light blue
+    value_label='Primary and Secondary School Attendance Rate',
+    title='School Attendance Rate',
+    filename='pri_sec_school_attendance.png',
+    groups=None,
+    layout='compact',
+    title_fontsize=10
+)
 
 def plot_school_attendance_rate(school_attendance_rate):
     """
@@ -360,55 +229,11 @@ def plot_school_attendance_rate(school_attendance_rate):
     for different groups.
 
     Parameters:
-        school_attendance_rate (dict): Dictionary where keys are group names and values are
-            dicts with 'Yes -----> (%)' and 'No -----> (%)' attendance rates as strings.
+        school_attendance_rate (ProportionTable): Weighted 'Yes' and 'No' attendance proportions
+            for each group.
     """
+    render_stacked_bars(SCHOOL_ATTENDANCE_CHART, school_attendance_rate)
 
-    # Prepare data
-    groups = list(school_attendance_rate.keys())
-    categories = ['No -----> (%)', 'Yes -----> (%)']  # Ensure order: No then Yes
-
-    data = []
-    for group in groups:
-        values = [float(school_attendance_rate[group][cat].replace('%', '')) for cat in categories]
-        data.append(values)
-
-    # Plot settings
-    bar_height = 0.2
-    y_pos = np.arange(len(groups))
-    fig, ax = plt.subplots(figsize=(8, 3))
-
-    # Colors
-    colors = ['#1f77b4', '#aec7e8']  # No = dark blue, Yes = light blue
-
-    # Plot
-    left = np.zeros(len(groups))
-    for idx, category in enumerate(categories):
-        values = [data[group_idx][idx] for group_idx in range(len(groups))]
-        label = 'No' if 'No' in category else 'Yes'
-        ax.barh(y_pos, values, left=left, height=bar_height, label=label, color=colors[idx])
-        left += values
-
-    # Decorate plot
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups)
-    ax.set_xlim(0, 100)
-    ax.set_xlabel('Primary and Secondary School Attendance Rate')
-    ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'{int(x)}%'))
-    ax.spines['right'].set_visible(False)
-    ax.spines['top'].set_visible(False)
-
-    # Legend
-    ax.legend(title='Response', loc='upper center', bbox_to_anchor=(0.5, 1.25),
-              ncol=2, frameon=False)
-
-    # Optional bottom text
-    plt.tight_layout(rect=[0, 0.05, 1, 1])
-    fig.text(0.01, 0.03, 'School Attendance Rate', ha='left', va='bottom', fontsize=10, fontweight='bold')
-
-    # Save and show
-    plt.savefig('pri_sec_school_attendance.png', dpi=300, bbox_inches='tight')
-    plt.show()
 
 def plot_school_attendance_frequency(school_attendance_frequency):
     """
@@ -416,10 +241,10 @@ def plot_school_attendance_frequency(school_attendance_frequency):
     between Host community and Refugees.
 
     Parameters:
-        school_attendance_frequency (dict): Dictionary with keys 'Host community North' and 'Refugees',
-            each containing two keys:
-                - 'Most Of The Year -----> (%)'
-                - "Less Than Most Of The Year Or Don'T Know -----> (%)"
+        school_attendance_frequency (ProportionTable): Weighted proportions for 'Host community North'
+            and 'Refugees' with two categories:
+                - 'Most Of The Year'
+                - "Less Than Most Of The Year Or Don'T Know"
     """
     # Categories and colors
     categories = ['Most Of The Year', "Less Than Most Of The Year Or Don'T Know"]
@@ -428,19 +253,13 @@ def plot_school_attendance_frequency(school_attendance_frequency):
     color_host = '#aec7e8'    # Soft light blue
     color_refugee = '#1f77b4' # Deep bold blue
 
-    # Values
-    host_values = [
-        float(school_attendance_frequency['Host community North']['Most Of The Year -----> (%)'].replace('%', '')),
-        float(school_attendance_frequency['Host community North']["Less Than Most Of The Year Or Don'T Know -----> (%)"].replace('%', '')),
-    ][::-1]
-
-    refugee_values = [
-        float(school_attendance_frequency['Refugees']['Most Of The Year -----> (%)'].replace('%', '')),
-        float(school_attendance_frequency['Refugees']["Less Than Most Of The Year Or Don'T Know -----> (%)"].replace('%', '')),
-    ][::-1]
+    # Values (categories are already reversed)
+    values = percentage_matrix(school_attendance_frequency, ['Host community North', 'Refugees'], categories)
+    host_values = values[0]
+    refugee_values = values[1]
 
     # Plot
-    fig, axes = plt.subplots(1, 2, figsize=(14, 5), sharey=True)
+    fig, axes = subplots(1, 2, figsize=(14, 5), sharey=True)
 
     # Host plot
     axes[0].barh(categories, host_values, color=color_host)
@@ -473,9 +292,8 @@ def plot_school_attendance_frequency(school_attendance_frequency):
                         fontsize=9,
                         fontweight='bold')
 
-    plt.tight_layout()
-    plt.savefig('frequency_school_attendance.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, 'frequency_school_attendance.png')
 
 
 
@@ -491,44 +309,20 @@ def plot_education_delay_rate(education_delay_rate):
 
     # Settings
     n_rows, n_cols = 10, 10
-    groups = list(education_delay_rate.keys())
+    groups = result_groups(education_delay_rate)
+    rates = percentage_matrix(education_delay_rate, groups, categories)
 
     # Create figure
-    fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+    fig, axes = subplots(1, 2, figsize=(12, 6))
     fig.patch.set_facecolor('#152745')
 
     for idx, group in enumerate(groups):
         ax = axes[idx]
         ax.set_facecolor('#152745')
 
-        # Convert and round data
-        values = education_delay_rate[group]
-        counts = {
-            cat: int(round(float(values[f'{cat} -----> (%)'].replace('%', ''))))
-            for cat in categories
-        }
-
-        # Fix total dots = 100
-        total = sum(counts.values())
-        if total != 100:
-            diff = 100 - total
-            max_cat = max(counts, key=counts.get)
-            counts[max_cat] += diff
-
-        # Build data grid
-        data = sum([[cat] * counts[cat] for cat in categories], [])
-        data = np.array(data).reshape((n_rows, n_cols))
-
-        # Plot dots
-        for i in range(n_rows):
-            for j in range(n_cols):
-                label = data[i, j]
-                ax.scatter(j, n_rows - i - 1, color=colors[label], s=100, edgecolors='white', linewidth=0.5)
-
-        ax.set_xlim(-0.5, n_cols - 0.5)
-        ax.set_ylim(-0.5, n_rows - 0.5)
-        ax.set_aspect('equal')
-        ax.axis('off')
+        # Dots per category, adding up to the grid size
+        counts = dot_counts(rates[idx], n_rows * n_cols)
+        draw_dot_grid(ax, counts, [colors[cat] for cat in categories], n_rows, n_cols)
         ax.set_title(group, fontsize=14, weight='bold', color='white')
 
     # Main title
@@ -542,23 +336,14 @@ def plot_education_delay_rate(education_delay_rate):
     ]
     fig.legend(legend_elements, categories, loc='lower center', ncol=3, frameon=False, fontsize=12, labelcolor='white')
 
-    plt.tight_layout(rect=[0, 0.05, 1, 0.95])
-    plt.show()
-
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95])
+    finish_figure(fig)
 
-def plot_school_type_rate(school_type_rate):
-    # Categories in order you want
-    categories = [
-        'Government Or Public',
-        'Un Or Ngo',
-        'Other: Specify',
-        'Community',
-        'Private',
-        'Religious Or Faith-Based Organization'
-    ]
 
-    # Color mapping
-    colors = {
+SCHOOL_TYPE_CHART = StackedBarSpec(
+    ['Government Or Public', 'Un Or Ngo', 'Other: Specify', 'Community', 'Private',
+     'Religious Or Faith-Based Organization'],
+    {
         'Government Or Public': '#152745',
         'Un Or Ngo': '#0066b3',
         'Other: Specify': '#FFD700',
@@ -566,54 +351,11 @@ def plot_school_type_rate(school_type_rate):
         'Private': '#7cd2c2',
         'Religious Or Faith-Based Organization': '#a8c4e3'
     }
+)
 
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in school_type_rate[group]:
-                val = float(school_type_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
+def plot_school_type_rate(school_type_rate):
+    render_stacked_bars(SCHOOL_TYPE_CHART, school_type_rate)
 
-    # Show plot
-    plt.show()
 
 
 
@@ -622,24 +364,18 @@ def plot_attendance_accepted_rate(attendance_n_accepted_rate):
     This function generates a horizontal bar plot showing the percentages of 'Accepted' 
     and 'Not Accepted' for different groups (e.g., Refugees and Host community North).
     
-    It expects a dictionary `attendance_n_accepted_rate` with the structure:
-    - Keys are group names (e.g., 'Refugees', 'Host community North')
-    - Values are dictionaries with keys 'Yes -----> (%)' and 'No -----> (%)' containing the corresponding percentages.
+    It expects a ProportionTable `attendance_n_accepted_rate` with the groups 'Refugees' and
+    'Host community North' and the categories 'Yes' and 'No'.
     
     Args:
-    - attendance_n_accepted_rate (dict): Dictionary containing the attendance acceptance data.
+    - attendance_n_accepted_rate (ProportionTable): Weighted attendance acceptance proportions.
     """
     
     # Process data
     group_labels = ['Refugees', 'Host community North']
-    values_yes = [
-        float(attendance_n_accepted_rate['Refugees']['Yes -----> (%)'].replace('%', '')),
-        float(attendance_n_accepted_rate['Host community North']['Yes -----> (%)'].replace('%', ''))
-    ]
-    values_no = [
-        float(attendance_n_accepted_rate['Refugees']['No -----> (%)'].replace('%', '')),
-        float(attendance_n_accepted_rate['Host community North']['No -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(attendance_n_accepted_rate, group_labels, ['Yes', 'No'])
+    values_yes = values[:, 0]
+    values_no = values[:, 1]
 
     # Reverse order for top-down
     values_yes = values_yes[::-1]
@@ -650,7 +386,7 @@ def plot_attendance_accepted_rate(attendance_n_accepted_rate):
     y = np.arange(len(group_labels))
     height = 0.35
 
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig, ax = subplots(figsize=(9, 5))
 
     # Custom premium colors
     deep_blue = '#1f77b4'    # Deep premium blue
@@ -688,8 +424,8 @@ def plot_attendance_accepted_rate(attendance_n_accepted_rate):
                         fontsize=9,
                         fontweight='bold')
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
 
 
 
@@ -699,34 +435,32 @@ def plot_top_reasons_for_not_attending_school(data):
     grouped by different categories (e.g., Host community North and Refugees).
     
     The function takes a dictionary `data` where each key is a group name (e.g., 'Host community North', 'Refugees'),
-    and the values are dictionaries where keys are reasons and the values are percentages (as strings with a '%' symbol).
+    and the values are dictionaries where keys are reasons and the values are percentages, as returned by
+    `survey_stats.top_categories`. `data` is not modified.
     
     Args:
-    - data (dict): Dictionary containing reasons for not attending school with corresponding percentages for each group.
+    - data (dict): Ranked reasons for not attending school with corresponding percentages for each group.
     """
     
-    # Convert percentage strings to floats
-    for group in data:
-        for reason in data[group]:
-            data[group][reason] = float(data[group][reason].replace('%', ''))
+    # Reasons of every group, missing ones count as 0
+    groups = list(data)
+    reasons = list(dict.fromkeys(reason for group in groups for reason in data[group]))
+    values = np.array([[data[group].get(reason, 0) for group in groups] for reason in reasons],
+                      dtype=float).reshape(len(reasons), len(groups))
 
-    # Create dataframe
-    df1 = pd.DataFrame(data).fillna(0)
-
-    # Sort by total impact (optional)
-    df1['Total'] = df1.sum(axis=1)
-    df1 = df1.sort_values('Total', ascending=True)
-    df1.drop(columns='Total', inplace=True)
+    # Sort by total impact, largest on top
+    order = np.argsort(values.sum(axis=1), kind='stable')
+    df1 = pd.DataFrame(values[order], index=[reasons[i] for i in order], columns=groups)
 
     # Plotting
-    fig, ax = plt.subplots(figsize=(10, 7))
+    fig, ax = subplots(figsize=(10, 7))
 
     df1.plot(kind='barh', ax=ax, color=['#1f77b4', '#aec7e8'])  # dark and light blue
     ax.set_xlabel('Percentage (%)')
     ax.set_title('Top Reasons for Not Attending School (≥10%)')
-    plt.legend(title='Group')
-    plt.tight_layout()
-    plt.show()
+    ax.legend(title='Group')
+    fig.tight_layout()
+    finish_figure(fig)
 
 
 
@@ -734,24 +468,18 @@ def plot_interruptions_rate(interruptions_rate):
     """
     This function generates a horizontal bar plot comparing the interruptions rate for different groups.
     
-    It takes the dictionary `interruptions_rate` where each key represents a group (e.g., 'Refugees North', 'Host community North') 
-    and the values are dictionaries with keys 'Yes -----> (%)' and 'No -----> (%)' indicating the percentages of interrupted and 
-    non-interrupted attendance rates.
+    It takes the ProportionTable `interruptions_rate` with one row per group (e.g., 'Refugees', 'Host community North') 
+    and the categories 'Yes' and 'No' indicating the proportions of interrupted and non-interrupted attendance rates.
 
     Args:
-    - interruptions_rate (dict): Dictionary containing groups as keys and their respective interruption rates as values.
+    - interruptions_rate (ProportionTable): Weighted interruption proportions per group.
     """
     
     # Process data
     group_labels = ['Refugees', 'Host community North']
-    values_yes = [
-        float(interruptions_rate['Refugees']['Yes -----> (%)'].replace('%', '')),
-        float(interruptions_rate['Host community North']['Yes -----> (%)'].replace('%', ''))
-    ]
-    values_no = [
-        float(interruptions_rate['Refugees']['No -----> (%)'].replace('%', '')),
-        float(interruptions_rate['Host community North']['No -----> (%)'].replace('%', ''))
-    ]
+    values = percentage_matrix(interruptions_rate, group_labels, ['Yes', 'No'])
+    values_yes = values[:, 0]
+    values_no = values[:, 1]
 
     # Reverse order for top-down
     values_yes = values_yes[::-1]
@@ -762,7 +490,7 @@ def plot_interruptions_rate(interruptions_rate):
     y = np.arange(len(group_labels))
     height = 0.35
 
-    fig, ax = plt.subplots(figsize=(9, 5))
+    fig, ax = subplots(figsize=(9, 5))
 
     # Custom premium colors
     deep_blue = '#1f77b4'    # Deep premium blue
@@ -800,8 +528,8 @@ def plot_interruptions_rate(interruptions_rate):
                         fontsize=9,
                         fontweight='bold')
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
 
 
 
@@ -813,15 +541,17 @@ def plot_school_interruption_reasons(host_reasons, refugee_reasons):
     Args:
     - host_reasons (dict): A dictionary with reasons as keys and percentage values for host communities.
     - refugee_reasons (dict): A dictionary with reasons as keys and percentage values for refugees.
+      Both are typically one group of `survey_stats.top_categories`.
     """
     
-    # Sorting and aligning categories
-    categories = sorted(set(host_reasons) | set(refugee_reasons))
+    # Aligning categories, highest percentage in either group first
+    categories = sorted(sorted(set(host_reasons) | set(refugee_reasons)),
+                        key=lambda cat: -max(host_reasons.get(cat, 0), refugee_reasons.get(cat, 0)))
     host_values = [host_reasons.get(cat, 0) for cat in categories]
     refugee_values = [refugee_reasons.get(cat, 0) for cat in categories]
 
     # Plotting
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = subplots(figsize=(10, 6))
     bar_width = 0.4
     x = range(len(categories))
 
@@ -835,9 +565,8 @@ def plot_school_interruption_reasons(host_reasons, refugee_reasons):
     ax.set_yticklabels(categories)
     ax.invert_yaxis()  # highest values on top
     ax.legend()
-    plt.tight_layout()
-    plt.savefig('Top Reasons for Last School Interruption.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig, 'Top Reasons for Last School Interruption.png')
 
 
 
@@ -856,7 +585,7 @@ def plot_illiteracy_data(illiteracy_data):
     values = list(illiteracy_data.values())
 
     # Plot
-    fig, ax = plt.subplots(figsize=(8, 4))
+    fig, ax = subplots(figsize=(8, 4))
     bars = ax.barh(labels, values, color=bar_color)
 
     # Add percentage labels on bars
@@ -878,10 +607,20 @@ def plot_illiteracy_data(illiteracy_data):
     ax.spines['bottom'].set_visible(False)
     ax.grid(False)
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    finish_figure(fig)
+
+
 
+# Washington Group answer scale colors shared by the difficulty charts
+DIFFICULTY_COLORS = {
+    'No Difficulty': '#152745',
+    'Some Difficulty': '#0066b3',
+    'A Lot Of Difficulty': '#a8c4e3',
+    'Cannot Do At All': '#00a89c'
+}
 
+DIFFICULTY_SEEING_CHART = StackedBarSpec(['No Difficulty', 'Some Difficulty', 'A Lot Of Difficulty'], DIFFICULTY_COLORS)
 
 def plot_difficulty_seeing(difficulty_seeing_rate):
     """
@@ -890,73 +629,15 @@ def plot_difficulty_seeing(difficulty_seeing_rate):
     in each group who experience 'No Difficulty', 'Some Difficulty', and 'A Lot Of Difficulty'.
 
     Args:
-    - difficulty_seeing_rate (dict): A dictionary where keys are group names, and values are dictionaries 
-                                      with categories as keys and percentage values as strings.
+    - difficulty_seeing_rate (ProportionTable): Weighted proportions per group over the 
+                                      difficulty categories.
     """
-    
-    # Categories in order you want
-    categories = [
-        'No Difficulty',
-        'Some Difficulty',
-        'A Lot Of Difficulty'
-    ]
-
-    # Color mapping
-    colors = {
-        'No Difficulty': '#152745',
-        'Some Difficulty': '#0066b3',
-        'A Lot Of Difficulty': '#a8c4e3'
-    }
+    render_stacked_bars(DIFFICULTY_SEEING_CHART, difficulty_seeing_rate)
 
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in difficulty_seeing_rate[group]:
-                val = float(difficulty_seeing_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
 
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.show()
 
 
+DIFFICULTY_HEARING_CHART = StackedBarSpec(['No Difficulty', 'Some Difficulty', 'A Lot Of Difficulty', 'Cannot Do At All'], DIFFICULTY_COLORS)
 
 def plot_difficulty_hearing(difficulty_hearing_rate):
     """
@@ -966,75 +647,15 @@ def plot_difficulty_hearing(difficulty_hearing_rate):
     'Cannot Do At All'.
 
     Args:
-    - difficulty_hearing_rate (dict): A dictionary where keys are group names, and values are dictionaries 
-                                      with categories as keys and percentage values as strings.
+    - difficulty_hearing_rate (ProportionTable): Weighted proportions per group over the 
+                                      difficulty categories.
     """
-    
-    # Categories in order you want
-    categories = [
-        'No Difficulty',
-        'Some Difficulty',
-        'A Lot Of Difficulty',
-        'Cannot Do At All'
-    ]
-
-    # Color mapping
-    colors = {
-        'No Difficulty': '#152745',
-        'Some Difficulty': '#0066b3',
-        'A Lot Of Difficulty': '#a8c4e3',
-        'Cannot Do At All' : '#00a89c'
-    }
-
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in difficulty_hearing_rate[group]:
-                val = float(difficulty_hearing_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
+    render_stacked_bars(DIFFICULTY_HEARING_CHART, difficulty_hearing_rate)
 
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
 
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.show()
 
 
+DIFFICULTY_WALKING_CHART = StackedBarSpec(['No Difficulty', 'Some Difficulty', 'A Lot Of Difficulty', 'Cannot Do At All'], DIFFICULTY_COLORS)
 
 def plot_difficulty_walking(difficulty_walking_rate):
     """
@@ -1044,75 +665,15 @@ def plot_difficulty_walking(difficulty_walking_rate):
     'Cannot Do At All'.
 
     Args:
-    - difficulty_walking_rate (dict): A dictionary where keys are group names, and values are dictionaries 
-                                      with categories as keys and percentage values as strings.
+    - difficulty_walking_rate (ProportionTable): Weighted proportions per group over the 
+                                      difficulty categories.
     """
-    
-    # Categories in order you want
-    categories = [
-        'No Difficulty',
-        'Some Difficulty',
-        'A Lot Of Difficulty',
-        'Cannot Do At All'
-    ]
-
-    # Color mapping
-    colors = {
-        'No Difficulty': '#152745',
-        'Some Difficulty': '#0066b3',
-        'A Lot Of Difficulty': '#a8c4e3',
-        'Cannot Do At All' : '#00a89c'
-    }
-
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
+    render_stacked_bars(DIFFICULTY_WALKING_CHART, difficulty_walking_rate)
 
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in difficulty_walking_rate[group]:
-                val = float(difficulty_walking_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
 
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.show()
 
 
+DIFFICULTY_CONCENTRATING_CHART = StackedBarSpec(['No Difficulty', 'Some Difficulty', 'A Lot Of Difficulty'], DIFFICULTY_COLORS)
 
 def plot_difficulty_concentrating(difficulty_concentrating_rate):
     """
@@ -1121,73 +682,15 @@ def plot_difficulty_concentrating(difficulty_concentrating_rate):
     in each group who experience 'No Difficulty', 'Some Difficulty', and 'A Lot Of Difficulty'.
 
     Args:
-    - difficulty_concentrating_rate (dict): A dictionary where keys are group names, and values are dictionaries 
-                                            with categories as keys and percentage values as strings.
+    - difficulty_concentrating_rate (ProportionTable): Weighted proportions per group over the 
+                                            difficulty categories.
     """
-    
-    # Categories in order you want
-    categories = [
-        'No Difficulty',
-        'Some Difficulty',
-        'A Lot Of Difficulty'
-    ]
+    render_stacked_bars(DIFFICULTY_CONCENTRATING_CHART, difficulty_concentrating_rate)
 
-    # Color mapping
-    colors = {
-        'No Difficulty': '#152745',
-        'Some Difficulty': '#0066b3',
-        'A Lot Of Difficulty': '#a8c4e3'
-    }
 
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in difficulty_concentrating_rate[group]:
-                val = float(difficulty_concentrating_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.show()
 
 
+DIFFICULTY_SELFCARE_CHART = StackedBarSpec(['No Difficulty', 'Some Difficulty', 'A Lot Of Difficulty', 'Cannot Do At All'], DIFFICULTY_COLORS)
 
 def plot_difficulty_selfcare(difficulty_selfcare_rate):
     """
@@ -1197,75 +700,15 @@ def plot_difficulty_selfcare(difficulty_selfcare_rate):
     and 'Cannot Do At All' in self-care.
 
     Args:
-    - difficulty_selfcare_rate (dict): A dictionary where keys are group names, and values are dictionaries 
-                                        with categories as keys and percentage values as strings.
+    - difficulty_selfcare_rate (ProportionTable): Weighted proportions per group over the 
+                                        difficulty categories.
     """
-    
-    # Categories in order you want
-    categories = [
-        'No Difficulty',
-        'Some Difficulty',
-        'A Lot Of Difficulty',
-        'Cannot Do At All'
-    ]
-
-    # Color mapping
-    colors = {
-        'No Difficulty': '#152745',
-        'Some Difficulty': '#0066b3',
-        'A Lot Of Difficulty': '#a8c4e3',
-        'Cannot Do At All': '#00a89c'
-    }
-
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in difficulty_selfcare_rate[group]:
-                val = float(difficulty_selfcare_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
+    render_stacked_bars(DIFFICULTY_SELFCARE_CHART, difficulty_selfcare_rate)
 
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
 
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.show()
 
 
+DIFFICULTY_COMMUNICATING_CHART = StackedBarSpec(['No Difficulty', 'Some Difficulty', 'A Lot Of Difficulty', 'Cannot Do At All'], DIFFICULTY_COLORS)
 
 def plot_difficulty_communicating(difficulty_communicating_rate):
     """
@@ -1275,70 +718,7 @@ def plot_difficulty_communicating(difficulty_communicating_rate):
     and 'Cannot Do At All' in communication.
 
     Args:
-    - difficulty_communicating_rate (dict): A dictionary where keys are group names, and values are dictionaries 
-                                              with categories as keys and percentage values as strings.
+    - difficulty_communicating_rate (ProportionTable): Weighted proportions per group over the 
+                                              difficulty categories.
     """
-    
-    # Categories in order you want
-    categories = [
-        'No Difficulty',
-        'Some Difficulty',
-        'A Lot Of Difficulty',
-        'Cannot Do At All'
-    ]
-
-    # Color mapping
-    colors = {
-        'No Difficulty': '#152745',
-        'Some Difficulty': '#0066b3',
-        'A Lot Of Difficulty': '#a8c4e3',
-        'Cannot Do At All': '#00a89c'
-    }
-
-    # Groups
-    groups = ['Host community North', 'Refugees']
-
-    # Prepare data
-    group_data = {group: [] for group in groups}
-
-    for group in groups:
-        for cat in categories:
-            key = f'{cat} -----> (%)'
-            if key in difficulty_communicating_rate[group]:
-                val = float(difficulty_communicating_rate[group][key].replace('%', ''))
-            else:
-                val = 0.0  # If missing, assume 0
-            group_data[group].append(val)
-
-    # Plotting
-    fig, ax = plt.subplots(figsize=(10, 4.5))  # Wide, not too tall
-
-    y_pos = np.arange(len(groups))
-    left = np.zeros(len(groups))
-    bar_height = 0.2  # Thick bars
-
-    for i, cat in enumerate(categories):
-        values = [group_data[group][i] for group in groups]
-        ax.barh(y_pos, values, left=left, color=colors[cat], label=cat, height=bar_height)
-        left += values
-
-    # Aesthetics
-    ax.set_yticks(y_pos)
-    ax.set_yticklabels(groups, fontsize=11)
-    ax.invert_yaxis()  # Top to bottom order
-    ax.set_xlabel('Percentage (%)', fontsize=12)
-    ax.set_xlim(0, 100)
-
-    # Simple legend
-    ax.legend(loc='lower center', bbox_to_anchor=(0.5, -0.45), ncol=2, frameon=False, fontsize=10)
-
-    # Background and grid
-    ax.set_facecolor('white')
-    fig.patch.set_facecolor('white')
-    ax.xaxis.grid(True, linestyle='-', alpha=0.1)
-
-    # Layout
-    plt.tight_layout()
-
-    # Show plot
-    plt.show()
+    render_stacked_bars(DIFFICULTY_COMMUNICATING_CHART, difficulty_communicating_rate)
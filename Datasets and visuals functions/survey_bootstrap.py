@@ -0,0 +1,182 @@
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from survey_stats import _answer_codes
+
+
+def cluster_sum_matrix(indicators, cluster, group_col='Intro_07_1'):
+    """
+    Weighted sums of every indicator answer per (group, household) pair.
+
+    The bootstrap only needs these sums: a replicate that draws a household k times
+    adds k times its row of the matrix, so the survey rows are reduced once up front.
+
+    Parameters:
+    - indicators (dict): Indicator name -> keyword arguments of
+      `weighted_category_proportions` ('df', 'var', 'weight', 'var_values' and optionally
+      'merge_dict'). Each indicator may use its own subset of the survey rows.
+    - cluster (str): Household id column, shared by every indicator's frame (e.g. 'ID').
+    - group_col (str): Column holding the population group.
+
+    Returns:
+    - sums (ndarray): Shape (n_pairs, n_columns), pairs sorted by group.
+    - counts (ndarray): Unweighted respondents per pair and column.
+    - pair_groups (ndarray): Group code of each pair.
+    - groups (Index): Sorted group labels.
+    - blocks (dict): Indicator name -> (first column, categories).
+    """
+    coded = {}
+    for name, spec in indicators.items():
+        df, _, groups, cat_codes, categories = _answer_codes(
+            spec['df'], spec['var'], spec['var_values'], spec.get('merge_dict'), group_col
+        )
+        coded[name] = (df[group_col], df[cluster], cat_codes, categories, df[spec['weight']].to_numpy(dtype=float))
+
+    groups = pd.Index([])
+    for group_values, _, _, _, _ in coded.values():
+        groups = groups.union(pd.Index(group_values.unique()))
+    groups = groups.sort_values()
+
+    # Households are matched across indicators on (group, cluster id)
+    keys = pd.concat([pd.DataFrame({'group': groups.get_indexer(group_values), 'cluster': cluster_values.to_numpy()})
+                      for group_values, cluster_values, _, _, _ in coded.values()], ignore_index=True)
+    missing = keys['cluster'].isna().to_numpy()
+    cluster_ids, _ = pd.factorize(keys['cluster'])
+    # Rows without a household id are households of their own
+    cluster_ids[missing] = cluster_ids.max() + 1 + np.arange(missing.sum())
+    pair_codes, pair_keys = pd.factorize(keys['group'].to_numpy(dtype=np.int64) * (cluster_ids.max() + 1) + cluster_ids,
+                                         sort=True)
+    pair_groups = np.asarray(pair_keys) // (cluster_ids.max() + 1)
+
+    blocks = {}
+    n_columns = 0
+    for name, (_, _, _, categories, _) in coded.items():
+        blocks[name] = (n_columns, categories)
+        n_columns += len(categories)
+
+    n_pairs = len(pair_keys)
+    sums = np.zeros(n_pairs * n_columns)
+    counts = np.zeros(n_pairs * n_columns, dtype=np.int64)
+    offset = 0
+    for name, (_, _, cat_codes, _, weights) in coded.items():
+        rows = pair_codes[offset:offset + len(cat_codes)]
+        cells = rows * n_columns + blocks[name][0] + cat_codes
+        sums += np.bincount(cells, weights=weights, minlength=n_pairs * n_columns)
+        counts += np.bincount(cells, minlength=n_pairs * n_columns)
+        offset += len(cat_codes)
+
+    return (sums.reshape(n_pairs, n_columns), counts.reshape(n_pairs, n_columns),
+            pair_groups, groups, blocks)
+
+
+def _replicate_sums(sums, segments, n_replicates, seed):
+    """
+    Weighted sums of `n_replicates` bootstrap samples, shape (n_replicates, n_groups, n_columns).
+    Within each group, as many households are drawn with replacement as were surveyed.
+    """
+    rng = np.random.default_rng(seed)
+    replicates = np.zeros((n_replicates, len(segments), sums.shape[1]))
+    for g, (start, stop) in enumerate(segments):
+        n_clusters = stop - start
+        if n_clusters == 0:
+            continue
+        draws = rng.multinomial(n_clusters, np.full(n_clusters, 1 / n_clusters), size=n_replicates)
+        replicates[:, g] = draws @ sums[start:stop]
+    return replicates
+
+
+def _shared_replicate_sums(shm_name, shape, segments, n_replicates, seed):
+    # Worker side: reads the cluster sums from shared memory instead of a pickled copy
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        sums = np.ndarray(shape, dtype=float, buffer=shm.buf)
+        return _replicate_sums(sums, segments, n_replicates, seed)
+    finally:
+        shm.close()
+
+
+def bootstrap_proportions(indicators, cluster, group_col='Intro_07_1', n_replicates=1000,
+                          confidence=0.95, seed=None, processes=None, block_size=100):
+    """
+    Household bootstrap confidence intervals for several indicators at once.
+
+    Households are resampled with replacement within each population group; all
+    indicators share the same draws. Each replicate is a product of household draw counts
+    with the per-household sums of `cluster_sum_matrix`, so no survey rows are copied.
+
+    Parameters:
+    - indicators (dict): Indicator name -> keyword arguments of
+      `weighted_category_proportions`, e.g.
+      {'measles': {'df': df, 'var': 'MV2', 'weight': 'wgh_str_u5',
+                   'var_values': measles_vaccination, 'merge_dict': merge_dict_measles}}.
+    - cluster (str): Household id column ('ID' in the FDS files).
+    - group_col (str): Column holding the population group.
+    - n_replicates (int): Number of bootstrap replicates.
+    - confidence (float): Confidence level of the percentile intervals.
+    - seed (int, optional): Seed making the replicates reproducible. Results do not
+      depend on `processes`.
+    - processes (int, optional): Worker processes. Replicate blocks are spread over a
+      process pool that reads the household sums from shared memory. None runs in-process.
+    - block_size (int): Replicates drawn per task.
+
+    Returns:
+    - DataFrame: One row per indicator x group x observed answer with the columns
+      indicator, group, category, weighted_percentage, standard_error, ci_lower, ci_upper
+      and count (percentages; standard error and bounds from the replicates).
+    """
+    sums, counts, pair_groups, groups, blocks = cluster_sum_matrix(indicators, cluster, group_col)
+    starts = np.searchsorted(pair_groups, np.arange(len(groups) + 1))
+    segments = [(int(starts[g]), int(starts[g + 1])) for g in range(len(groups))]
+
+    block_sizes = [min(block_size, n_replicates - start) for start in range(0, n_replicates, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(block_sizes))
+
+    if processes is None or processes <= 1:
+        replicates = [_replicate_sums(sums, segments, size, block_seed)
+                      for size, block_seed in zip(block_sizes, seeds)]
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(sums.nbytes, 1))
+        try:
+            np.ndarray(sums.shape, dtype=float, buffer=shm.buf)[:] = sums
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                replicates = list(pool.map(_shared_replicate_sums, [shm.name] * len(block_sizes),
+                                           [sums.shape] * len(block_sizes), [segments] * len(block_sizes),
+                                           block_sizes, seeds))
+        finally:
+            shm.close()
+            shm.unlink()
+    replicates = np.concatenate(replicates)
+
+    estimate = np.stack([sums[start:stop].sum(axis=0) for start, stop in segments])
+    group_counts = np.stack([counts[start:stop].sum(axis=0) for start, stop in segments])
+    alpha = (1 - confidence) / 2
+
+    frames = []
+    for name, (first, categories) in blocks.items():
+        columns = slice(first, first + len(categories))
+        with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+            # Groups that never answered give all-NaN replicates; they are dropped below
+            warnings.simplefilter('ignore', RuntimeWarning)
+            proportions = estimate[:, columns] / estimate[:, columns].sum(axis=1, keepdims=True)
+            replicate_proportions = replicates[:, :, columns] / replicates[:, :, columns].sum(axis=2, keepdims=True)
+            lower, upper = np.nanquantile(replicate_proportions, [alpha, 1 - alpha], axis=0)
+            standard_errors = np.nanstd(replicate_proportions, axis=0, ddof=1)
+
+        n_cats = len(categories)
+        frame = pd.DataFrame({
+            'indicator': name,
+            'group': np.repeat(groups, n_cats),
+            'category': np.tile([str(category).title() for category in categories], len(groups)),
+            'weighted_percentage': proportions.ravel() * 100,
+            'standard_error': standard_errors.ravel() * 100,
+            'ci_lower': lower.ravel() * 100,
+            'ci_upper': upper.ravel() * 100,
+            'count': group_counts[:, columns].ravel(),
+        })
+        frames.append(frame[frame['count'] > 0])
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+
+import pandas as pd
+
+from survey_stats import weighted_category_proportions
+
+
+def frame_fingerprint(df):
+    """
+    SHA-256 of a frame's content: column names, dtypes, index and values.
+    Two frames with the same data get the same fingerprint, wherever they were loaded from.
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _canonical(values):
+    # Order of answers and merge mappings does not change the result
+    return sorted(repr(value) for value in values)
+
+
+class IndicatorCache:
+    """
+    Memoized `weighted_category_proportions` results of one survey frame.
+
+    Results are content addressed: the key hashes the frame fingerprint with the query
+    (variable, weight column, answers, merge mapping, filter and cluster column). The
+    frame is hashed once, when the cache is built, so a repeated query is a key lookup
+    that never reads the frame. Recent results stay in an in-memory LRU layer; with
+    `cache_dir` they are also pickled to disk and reused by later sessions on the same data.
+
+    Parameters:
+    - df (DataFrame): Survey data. Call `refresh()` after changing it in place.
+    - cache_dir (str, optional): Folder of the on-disk layer. None keeps results in memory only.
+    - maxsize (int): Number of results kept in memory.
+    - group_col (str): Column holding the population group.
+    """
+
+    def __init__(self, df, cache_dir=None, maxsize=128, group_col='Intro_07_1'):
+        self.df = df
+        self.cache_dir = cache_dir
+        self.maxsize = maxsize
+        self.group_col = group_col
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self.refresh()
+
+    def refresh(self, df=None):
+        """
+        Re-hashes the frame (or switches to `df`); results of the old content are no longer served.
+        """
+        if df is not None:
+            self.df = df
+        self.fingerprint = frame_fingerprint(self.df)
+        return self
+
+    def key(self, var, weight, var_values, merge_dict=None, where=None, cluster=None):
+        """
+        Content address of a query, e.g. where="HH_02 == 'Female'" for a sub-population.
+        """
+        query = [self.fingerprint, var, weight, _canonical(var_values),
+                 _canonical((merge_dict or {}).items()), where, cluster, self.group_col]
+        return hashlib.sha256(json.dumps(query).encode('utf-8')).hexdigest()
+
+    def proportions(self, var, weight, var_values, merge_dict=None, where=None, cluster=None):
+        """
+        Same result as `weighted_category_proportions`, computed at most once per query.
+
+        Parameters:
+        - var, weight, var_values, merge_dict, cluster: As in `weighted_category_proportions`.
+        - where (str, optional): `DataFrame.query` expression selecting the rows to use,
+          e.g. "HH_02 == 'Female'" or "ageYears >= 3 and ageYears <= 5".
+
+        Returns:
+        - ProportionTable
+        """
+        key = self.key(var, weight, var_values, merge_dict, where, cluster)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        result = self._read(key)
+        if result is None:
+            self.misses += 1
+            df = self.df if where is None else self.df.query(where)
+            result = weighted_category_proportions(df, var, weight, var_values, merge_dict=merge_dict,
+                                                   group_col=self.group_col, cluster=cluster)
+            self._write(key, result)
+        else:
+            self.hits += 1
+
+        self._memory[key] = result
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+        return result
+
+    def clear(self):
+        """
+        Empties the in-memory layer (the on-disk layer is kept).
+        """
+        self._memory.clear()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.pkl')
+
+    def _read(self, key):
+        if self.cache_dir is None or not os.path.exists(self._path(key)):
+            return None
+        with open(self._path(key), 'rb') as f:
+            return pickle.load(f)
+
+    def _write(self, key, result):
+        if self.cache_dir is None:
+            return
+        # Written under a temporary name first so readers never see a partial file
+        tmp_path = self._path(key) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f)
+        os.replace(tmp_path, self._path(key))
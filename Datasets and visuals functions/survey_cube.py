@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+from survey_stats import _proportion_table
+
+
+class ContingencyCube:
+    """
+    Weighted crosstab of one survey answer over standard dimensions, e.g.
+    group x age x gender x response, built in a single pass over the rows.
+
+    Charts that compare sub-populations (by age, by gender, female/male marriage rates...)
+    are slices of the same table: a slice only indexes and sums the small array, it never
+    reads the survey rows again.
+
+    Attributes:
+    - dims (list): Dimension names, the response variable last.
+    - labels (list): Sorted labels (Index) of each dimension.
+    - weighted_counts (ndarray): Sum of weights per cell.
+    - counts (ndarray): Unweighted respondents per cell.
+    """
+
+    def __init__(self, dims, labels, weighted_counts, counts):
+        self.dims = list(dims)
+        self.labels = [pd.Index(axis_labels) for axis_labels in labels]
+        self.weighted_counts = np.asarray(weighted_counts, dtype=float)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self._positions = [{label: i for i, label in enumerate(axis_labels)} for axis_labels in self.labels]
+
+    @classmethod
+    def from_frame(cls, data, response, dims, weight='weights', encoder=None):
+        """
+        Aggregates `response` over `dims`.
+
+        Parameters:
+        - data (DataFrame or PartitionedSurvey): Survey rows. A PartitionedSurvey provides
+          the 'group' dimension.
+        - response (str): Answer column, e.g. 'hh_marital' or 'HH_08'.
+        - dims (list): Dimension columns, e.g. ['group', 'ind_age'] or ['Intro_07_1', 'HH_02'].
+        - weight (str): Column with the survey weights.
+        - encoder (callable, optional): Applied to the response first, e.g.
+          `survey_io.encode_response`.
+
+        Returns:
+        - ContingencyCube: Rows without an answer are left out. A missing dimension value is
+          kept as a NaN label, so those rows still count when that dimension is summed out.
+        """
+        if hasattr(data, 'partitions'):
+            data = data.to_frame(list(dims) + [response, weight])
+        values = data[response] if encoder is None else encoder(data[response])
+
+        codes, labels = [], []
+        columns = [data[dim] for dim in dims] + [values]
+        for axis, column in enumerate(columns):
+            column_codes, column_labels = pd.factorize(column, sort=True, use_na_sentinel=axis == len(dims))
+            if isinstance(column_labels.dtype, pd.CategoricalDtype):
+                # Plain labels, so slices only list the values that actually occur
+                column_labels = pd.Index(np.asarray(column_labels), dtype=object)
+            codes.append(column_codes)
+            labels.append(column_labels)
+
+        valid = np.logical_and.reduce([column_codes >= 0 for column_codes in codes])
+        shape = tuple(len(column_labels) for column_labels in labels)
+        cells = np.ravel_multi_index([column_codes[valid] for column_codes in codes], shape)
+        weights = data[weight].to_numpy(dtype=float)[valid]
+
+        size = int(np.prod(shape))
+        weighted_counts = np.bincount(cells, weights=weights, minlength=size).reshape(shape)
+        counts = np.bincount(cells, minlength=size).reshape(shape)
+        return cls(list(dims) + [response], labels, weighted_counts, counts)
+
+    @property
+    def response(self):
+        return self.dims[-1]
+
+    def _slice(self, by, where):
+        # Keep the `where` labels, then sum out every dimension not in `by`
+        weighted_counts, counts = self.weighted_counts, self.counts
+        labels = list(self.labels)
+        for axis, dim in enumerate(self.dims[:-1]):
+            if where and dim in where:
+                selected = where[dim]
+                if not isinstance(selected, (list, tuple, set, np.ndarray, pd.Index)):
+                    selected = [selected]
+                positions = [self._positions[axis][label] for label in selected if label in self._positions[axis]]
+                weighted_counts = weighted_counts.take(positions, axis=axis)
+                counts = counts.take(positions, axis=axis)
+                labels[axis] = labels[axis][positions]
+
+        summed = tuple(axis for axis, dim in enumerate(self.dims[:-1]) if dim not in by)
+        weighted_counts = weighted_counts.sum(axis=summed)
+        counts = counts.sum(axis=summed)
+
+        remaining = [dim for dim in self.dims[:-1] if dim in by]
+        order = [remaining.index(dim) for dim in by] + [len(by)]
+        by_labels = [labels[self.dims.index(dim)] for dim in by]
+        return weighted_counts.transpose(order), counts.transpose(order), by_labels
+
+    def sums(self, by=(), where=None):
+        """
+        Weighted sums and counts of each answer within every combination of `by`.
+
+        Parameters:
+        - by (list): Dimensions to keep, in output axis order.
+        - where (dict, optional): Dimension -> label (or list of labels) to restrict to,
+          e.g. {'group': 'Host'} or {'HH_02': 'Female'}.
+
+        Returns:
+        - weighted_counts, counts (ndarray): Shape (len(labels) per `by` dimension..., n_answers).
+        """
+        weighted_counts, counts, _ = self._slice(list(by), where)
+        return weighted_counts, counts
+
+    def proportions(self, by, where=None, var_values=None, merge_dict=None):
+        """
+        Same result as `survey_stats.weighted_category_proportions` for a slice of the cube,
+        with the `by` dimension as the groups.
+
+        Parameters:
+        - by (str): Group dimension, e.g. 'Intro_07_1'.
+        - where (dict, optional): See `sums`.
+        - var_values (list, optional): Answers to keep. Defaults to every answer.
+        - merge_dict (dict, optional): Mapping used to merge answers into broader categories.
+
+        Returns:
+        - ProportionTable
+        """
+        weighted_counts, counts, (groups,) = self._slice([by], where)
+        categories = self.labels[-1]
+        if var_values is not None:
+            keep = categories.isin(var_values)
+            weighted_counts, counts, categories = weighted_counts[:, keep], counts[:, keep], categories[keep]
+        if merge_dict:
+            merged_codes, categories = pd.factorize(pd.Index([merge_dict.get(label, label) for label in categories]),
+                                                    sort=True)
+            onehot = np.zeros((len(merged_codes), len(categories)), dtype=np.int64)
+            onehot[np.arange(len(merged_codes)), merged_codes] = 1
+            weighted_counts, counts = weighted_counts @ onehot, counts @ onehot
+
+        # Only groups and answers present in the slice, as when filtering the rows
+        rows = (counts.sum(axis=1) > 0) & groups.notna()
+        cols = counts.sum(axis=0) > 0
+        return _proportion_table(groups[rows], categories[cols],
+                                 weighted_counts[np.ix_(rows, cols)], counts[np.ix_(rows, cols)])
+
+    def to_frame(self, by=(), where=None):
+        """
+        Long table of the slice: columns [*by, response, 'count', 'weighted_count',
+        'weighted_percent'], the percentage being within each `by` combination. Only
+        observed combinations with known `by` values are listed.
+        """
+        by = list(by)
+        weighted_counts, counts, by_labels = self._slice(by, where)
+        axes = by_labels + [self.labels[-1]]
+        grid = pd.MultiIndex.from_product(axes, names=by + [self.response]).to_frame(index=False)
+        totals = weighted_counts.sum(axis=-1, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            percent = weighted_counts / totals * 100
+        grid['count'] = counts.ravel()
+        grid['weighted_count'] = weighted_counts.ravel()
+        grid['weighted_percent'] = percent.ravel()
+        return grid[grid['count'] > 0].dropna(subset=by).reset_index(drop=True)
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from survey_stats import partition_category_proportions
+
+
+class PartitionedSurvey:
+    """
+    Several population frames (e.g. Host and Refugee children) used as one logical table.
+
+    Each population keeps its own DataFrame: nothing is concatenated and no string
+    'group' column is added. Group-wise work goes straight to that group's partition,
+    and whole-table work loops over the partitions.
+
+    Parameters:
+    - partitions (dict): Group name -> DataFrame, in display order. Frames are not copied.
+    """
+
+    def __init__(self, partitions):
+        self.partitions = dict(partitions)
+
+    @classmethod
+    def from_frame(cls, df, group_col='group'):
+        """
+        Splits a combined frame (e.g. the old `combined_df`) on `group_col`, groups sorted.
+        """
+        return cls({group: part for group, part in df.groupby(group_col, sort=True, observed=True)})
+
+    @property
+    def groups(self):
+        return list(self.partitions)
+
+    @property
+    def columns(self):
+        columns = []
+        for df in self.partitions.values():
+            columns.extend(col for col in df.columns if col not in columns)
+        return columns
+
+    def __getitem__(self, group):
+        return self.partitions[group]
+
+    def __iter__(self):
+        return iter(self.partitions)
+
+    def __len__(self):
+        return sum(len(df) for df in self.partitions.values())
+
+    def items(self):
+        return self.partitions.items()
+
+    def sizes(self):
+        """
+        Number of rows of each partition, in group order.
+        """
+        return np.array([len(df) for df in self.partitions.values()])
+
+    def group_codes(self):
+        """
+        Integer group code of every row (0 for the first group, ...), in `to_frame` row order.
+        """
+        return np.repeat(np.arange(len(self.partitions), dtype=np.int8), self.sizes())
+
+    def map(self, func):
+        """
+        Applies `func` (DataFrame -> DataFrame) to every partition.
+        """
+        return PartitionedSurvey({group: func(df) for group, df in self.partitions.items()})
+
+    def filter(self, predicate):
+        """
+        Keeps the rows where `predicate(df)` is True, partition by partition.
+        e.g. survey.filter(lambda df: df['ind_age'] == '12_17')
+        """
+        return self.map(lambda df: df[predicate(df)])
+
+    def weighted_proportions(self, var, weight, var_values, merge_dict=None, encoder=None, cluster=None):
+        """
+        Weighted proportion of each answer of `var` per group (ProportionTable),
+        see `survey_stats.partition_category_proportions`.
+        """
+        return partition_category_proportions(self.partitions, var, weight, var_values,
+                                              merge_dict=merge_dict, encoder=encoder, cluster=cluster)
+
+    def to_frame(self, columns=None, group_col='group'):
+        """
+        Materializes one long frame for code that still needs it (e.g. seaborn's `hue`).
+
+        Only `columns` are copied. The group column is a categorical built from
+        `group_codes`, and categorical columns keep compact codes across partitions.
+        Columns missing from a partition are filled with NaN for its rows.
+        """
+        columns = self.columns if columns is None else list(columns)
+        data = {}
+        for col in columns:
+            pieces = [df[col] if col in df.columns else pd.Series(np.nan, index=df.index)
+                      for df in self.partitions.values()]
+            if all(isinstance(piece.dtype, pd.CategoricalDtype) for piece in pieces):
+                data[col] = union_categoricals([piece.array for piece in pieces])
+            else:
+                data[col] = pd.concat(pieces, ignore_index=True)
+        data[group_col] = pd.Categorical.from_codes(self.group_codes(), self.groups)
+        return pd.DataFrame(data)
+
+
+def as_partitioned(data, group_col='group'):
+    """
+    Returns `data` as a PartitionedSurvey, splitting a combined frame on `group_col` if needed.
+    """
+    if isinstance(data, PartitionedSurvey):
+        return data
+    return PartitionedSurvey.from_frame(data, group_col=group_col)
+
+
+def _counts(df, keys, weight):
+    grouped = df.groupby(keys, observed=True, sort=True)
+    table = grouped.size().rename('count').to_frame()
+    table['weighted_count'] = grouped[weight].sum() if weight in df.columns else np.nan
+    table = table.reset_index()
+    # Plain values, so charts only show the answers that actually occur
+    for key in keys:
+        table[key] = table[key].astype(object)
+    return table
+
+
+def count_table(data, column, by='group', weight='weights'):
+    """
+    Compact count table of `column` within each value of `by`.
+
+    The count plots of `bangladesh_visuals` draw their bars from this table rather than
+    from the survey rows, so their rendering cost depends on the number of answers, not
+    the number of respondents.
+
+    Parameters:
+    - data (DataFrame or PartitionedSurvey): Survey rows, or a table already returned by
+      this function for the same `by` and `column` (recognized by its exact columns and
+      returned unchanged, so callers can pre-compute it once).
+    - column (str): Answer to count (e.g. 'ind_gender').
+    - by (str): Column splitting the counts. With a PartitionedSurvey and by='group',
+      each partition is counted on its own; partitions without `column` are skipped.
+    - weight (str): Column with the survey weights.
+
+    Returns:
+    - DataFrame: Columns [by, column, 'count', 'weighted_count'], one row per observed pair.
+    """
+    columns = [by, column, 'count', 'weighted_count']
+    if isinstance(data, pd.DataFrame) and list(data.columns) == columns:
+        return data
+    if isinstance(data, PartitionedSurvey):
+        if by != 'group':
+            data = data.to_frame([by, column, weight])
+        else:
+            pieces = []
+            for group, df in data.items():
+                # A population without the question has no answers to count (as in `to_frame`)
+                if column not in df.columns:
+                    continue
+                table = _counts(df, [column], weight)
+                table.insert(0, by, group)
+                pieces.append(table)
+            if not pieces:
+                return pd.DataFrame(columns=columns)
+            return pd.concat(pieces, ignore_index=True)
+    return _counts(data, [by, column], weight)
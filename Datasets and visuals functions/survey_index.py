@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Number of set bits of every byte value
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class Bitmap:
+    """
+    A set of rows of a frame stored as packed bits (one bit per row, 8 rows per byte).
+
+    Bitmaps of the same frame combine with `&`, `|` and `~` byte by byte, without
+    touching the frame's columns.
+
+    Parameters:
+    - bits (ndarray): Packed uint8 bits, as returned by `np.packbits`.
+    - n_rows (int): Number of rows of the frame.
+    """
+
+    def __init__(self, bits, n_rows):
+        self.bits = bits
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_mask(cls, mask):
+        mask = np.asarray(mask, dtype=bool)
+        return cls(np.packbits(mask), len(mask))
+
+    def __and__(self, other):
+        return Bitmap(self.bits & other.bits, self.n_rows)
+
+    def __or__(self, other):
+        return Bitmap(self.bits | other.bits, self.n_rows)
+
+    def __invert__(self):
+        bits = ~self.bits
+        # Padding bits past the last row stay unset
+        if self.n_rows % 8:
+            bits[-1] &= np.uint8(0xFF << (8 - self.n_rows % 8) & 0xFF)
+        return Bitmap(bits, self.n_rows)
+
+    def count(self):
+        """
+        Number of rows in the set.
+        """
+        return int(_POPCOUNT[self.bits].sum())
+
+    def mask(self):
+        """
+        Boolean mask with one entry per row.
+        """
+        return np.unpackbits(self.bits, count=self.n_rows).astype(bool)
+
+    def positions(self):
+        """
+        Integer positions of the rows in the set.
+        """
+        return np.flatnonzero(self.mask())
+
+    def __repr__(self):
+        return f'Bitmap({self.count()} of {self.n_rows} rows)'
+
+
+class PredicateIndex:
+    """
+    Packed bitmaps of every value of the columns used to build sub-populations
+    (gender, age, population group...).
+
+    Each indexed column is scanned once. A predicate such as "ageYears between 3 and 5" is
+    then evaluated on the column's distinct values and answered by OR-ing their bitmaps,
+    and sub-populations are composed with `&` and `|`.
+    e.g. index.select(index.eq('HH_02', 'Female') & index.between('ageYears', 3, 5))
+
+    Parameters:
+    - df (DataFrame): Survey data. The index refers to its rows in their current order.
+    - columns (list): Columns to index, e.g. ['HH_02', 'ageYears', 'Intro_07_1'].
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.n_rows = len(df)
+        self._values = {}
+        self._bitmaps = {}
+        for col in columns:
+            codes, values = pd.factorize(df[col], sort=True)
+            self._values[col] = pd.Index(np.asarray(values))
+            # Each row sets its bit in the bitmap of its value: only packed bits are allocated
+            bitmaps = np.zeros((len(values), (self.n_rows + 7) // 8), dtype=np.uint8)
+            rows = np.flatnonzero(codes >= 0)
+            np.bitwise_or.at(bitmaps, (codes[rows], rows >> 3), (0x80 >> (rows & 7)).astype(np.uint8))
+            self._bitmaps[col] = bitmaps
+
+    @property
+    def columns(self):
+        return list(self._values)
+
+    def values(self, col):
+        """
+        Distinct non-missing values of an indexed column, sorted.
+        """
+        return self._values[col]
+
+    def where(self, col, predicate):
+        """
+        Rows whose `col` value satisfies `predicate`, a vectorized function of the
+        distinct values (e.g. lambda age: age < 10). Missing values never match.
+        """
+        selected = np.asarray(predicate(self._values[col]), dtype=bool)
+        if not selected.any():
+            return Bitmap(np.zeros((self.n_rows + 7) // 8, dtype=np.uint8), self.n_rows)
+        return Bitmap(np.bitwise_or.reduce(self._bitmaps[col][selected], axis=0), self.n_rows)
+
+    def eq(self, col, value):
+        return self.where(col, lambda values: values == value)
+
+    def isin(self, col, values):
+        return self.where(col, lambda column_values: column_values.isin(values))
+
+    def between(self, col, low, high):
+        """
+        Rows with low <= `col` <= high.
+        """
+        return self.where(col, lambda values: (values >= low) & (values <= high))
+
+    def select(self, bitmap):
+        """
+        The rows of the indexed frame in `bitmap`, like `df[mask]`.
+        """
+        return self.df.iloc[bitmap.positions()]
@@ -0,0 +1,434 @@
+import hashlib
+import json
+import os
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    # Without pyarrow the cache falls back to pickle, which also keeps categorical dtypes
+    CACHE_FORMAT = 'pickle'
+
+CACHE_DIR_NAME = '.survey_cache'
+
+# Columns of the FDS roster used in the children analysis
+ROSTER_COLUMNS = [
+    'Intro_07_1', 'admin0', 'admin1', 'ID', 'rosterposition', 'HH_03', 'HH_02',
+    'ageYears', 'HH_00', 'HH_00a_year', 'HH_00a_month', 'HH_00b_year', 'HH_00b_month',
+    'HH_11a', 'HH_11b', 'HH_13', 'ID_00', 'ID_01a', 'ID_01b', 'ID_02', 'ID_03',
+    'ID_04', 'ID_05', 'ID_06', 'ID_06b', 'ID_07', 'ID_08', 'ID_09', 'ID_10',
+    'ID_11', 'ID_VAR', 'HH_06', 'HH_06_specify', 'HH_07a', 'HH_07b', 'HH_08',
+    'HH_09', 'HH_16', 'HH_18', 'HH_19', 'HH_21', 'HH_22', 'HH_23', 'HH_25', 'HH_26',
+    'HH_27', 'HH_28', 'HH_29', 'HH_Educ00', 'HH_Educ01', 'HH_Educ02a', 'HH_Educ02b',
+    'HH_Educ02c', 'HH_Educ03', 'HH_Educ04a', 'HH_Educ04b', 'HH_Educ05', 'HH_Educ06',
+    'HH_Educ07', 'HH_Educ10', 'HH_Educ15a', 'HH_Educ15b', 'HH_Educ16', 'HH_Educ17',
+    'HH_Educ18', 'HH_Educ23', 'Dis_03', 'Dis_06', 'Dis_09', 'Dis_12', 'Dis_15',
+    'Dis_18', 'wgh_samp_resc_pop', 'wgh_samp_resc_str',
+]
+
+# Declared dtypes; remaining text answers become categorical after filtering
+ROSTER_DTYPES = {
+    'ageYears': 'str',
+    'ID': 'int64',
+    'rosterposition': 'int16',
+    'wgh_samp_resc_pop': 'float32',
+    'wgh_samp_resc_str': 'float32',
+}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """
+    Returns the SHA-256 hex digest of a file, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_answer_column(series, max_ratio=0.5):
+    """
+    True for text (or categorical) columns holding repeated answers rather than free text:
+    the number of distinct values is at most `max_ratio` of the non-null values.
+    """
+    if not (series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+            or isinstance(series.dtype, pd.CategoricalDtype)):
+        return False
+    non_null = series.notna().sum()
+    return bool(non_null) and series.nunique() <= max_ratio * non_null
+
+
+def to_categorical(df, max_ratio=0.5):
+    """
+    Converts text columns with few distinct values to the pandas 'category' dtype.
+
+    Only columns whose values are all strings are converted: object columns of other
+    values (e.g. True/False answers with missing rows) stay as they are, since their
+    categories would not survive the Parquet cache.
+
+    Parameters:
+    - df (DataFrame): Raw survey data.
+    - max_ratio (float): A column is converted when its number of distinct values is at
+      most this fraction of its non-null values. Free-text columns are left untouched.
+    """
+    for col in df.columns:
+        series = df[col]
+        if (not isinstance(series.dtype, pd.CategoricalDtype) and is_answer_column(series, max_ratio)
+                and pd.api.types.infer_dtype(series, skipna=True) == 'string'):
+            df[col] = series.astype('category')
+    return df
+
+
+def is_multiselect_column(series, sep=' '):
+    """
+    True for select-multiple columns: answers are lower-case option codes, and some answer
+    joins several codes with `sep`, at least one of which is also selected alone
+    (e.g. 'lack_school other' next to 'other'). Labels such as 'Host community North'
+    are single answers.
+    """
+    values = series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype) else series.dropna().unique()
+    values = pd.Index(values)
+    if not len(values) or values.inferred_type != 'string':
+        return False
+    if not values.str.fullmatch(rf'[0-9a-z_]+(?:{re.escape(sep)}[0-9a-z_]+)*').all():
+        return False
+    combined = values[values.str.contains(sep, regex=False)]
+    return bool(pd.Series(combined).str.split(sep).explode().isin(values).any())
+
+
+def _text_to_category(df):
+    # Text columns of one chunk as categoricals, so chunks are never held as object strings
+    text = [col for col in df.columns
+            if (df[col].dtype == object or pd.api.types.is_string_dtype(df[col].dtype))
+            and pd.api.types.infer_dtype(df[col], skipna=True) == 'string']
+    return df.astype({col: 'category' for col in text}) if text else df
+
+
+def concat_categorical(pieces, max_ratio=0.5):
+    """
+    Concatenates chunks whose text columns were converted to 'category' chunk by chunk.
+
+    Each categorical column gets the union of its chunks' categories (sorted, as
+    `to_categorical` gives them; only the small integer codes are rewritten) and the
+    chunks are then concatenated once, so the text is never expanded back to one string
+    per row. A column that is not a repeated answer over the whole frame (see
+    `is_answer_column`), or whose chunks hold different kinds of values, is returned as
+    text: the result is the frame `to_categorical(pd.concat(...))` would give.
+
+    Parameters:
+    - pieces (list): DataFrames with the same columns.
+    - max_ratio (float): As in `to_categorical`.
+    """
+    def is_categorical(part):
+        return isinstance(part.dtype, pd.CategoricalDtype)
+
+    categorical_dtypes, text_dtypes = {}, {}
+    for col in pieces[0].columns:
+        parts = [piece[col] for piece in pieces]
+        if not any(is_categorical(part) for part in parts):
+            continue
+        text_dtypes[col] = pd.concat([pd.Series([], dtype=part.cat.categories.dtype if is_categorical(part)
+                                                else part.dtype) for part in parts]).dtype
+        # Chunks without any answer hold no categories and take the others' ones
+        if any(part.notna().any() for part in parts if not is_categorical(part)):
+            continue
+        categories = [part.cat.categories for part in parts if is_categorical(part)]
+        if any(c.dtype != categories[0].dtype for c in categories):
+            continue
+        categorical_dtypes[col] = pd.CategoricalDtype(categories[0].append(categories[1:]).unique().sort_values())
+
+    # Columns that cannot share categories go back to text before concatenating
+    text_cols = [col for col in text_dtypes if col not in categorical_dtypes]
+    df = pd.concat([piece.astype({**categorical_dtypes,
+                                  **{col: text_dtypes[col] for col in text_cols if is_categorical(piece[col])}})
+                    for piece in pieces])
+
+    free_text = {col: text_dtypes[col] for col in categorical_dtypes if not is_answer_column(df[col], max_ratio)}
+    return df.astype(free_text) if free_text else df
+
+
+def canonical_response(value):
+    """
+    Canonical vocabulary token of a raw answer: lower case, apostrophes removed and every
+    other run of non-alphanumeric characters turned into '_'.
+    e.g. 'Yes ' -> 'yes', "Don't know" -> 'dont_know', '60+' -> '60_plus'.
+    """
+    token = str(value).strip().lower().replace("'", '').replace('\u2019', '').replace('+', '_plus')
+    return re.sub(r'[^0-9a-z]+', '_', token).strip('_')
+
+
+def encode_response(series):
+    """
+    Encodes a response column as a categorical whose categories are canonical tokens
+    (see `canonical_response`) and whose codes are compact integers (int8 for up to
+    127 answers); missing answers get code -1.
+
+    Only the distinct categories are normalized, never the individual rows, and a
+    column that is already encoded is returned unchanged. Non-text answers (e.g.
+    True/False flags) are returned as a plain categorical.
+    """
+    values = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    categories = list(values.cat.categories)
+    if not all(isinstance(category, str) for category in categories):
+        return values
+
+    tokens = [canonical_response(category) for category in categories]
+    vocabulary = sorted(set(tokens))
+    if tokens == categories and vocabulary == categories:
+        return values
+
+    position = {token: i for i, token in enumerate(vocabulary)}
+    # The extra trailing -1 maps missing values (code -1) to missing again
+    lookup = np.array([position[token] for token in tokens] + [-1])
+    codes = lookup[values.cat.codes.to_numpy()]
+    return pd.Series(pd.Categorical.from_codes(codes, vocabulary), index=series.index, name=series.name)
+
+
+def normalize_responses(df, columns=None, exclude=('group', 'Intro_07_1')):
+    """
+    One-time normalization of the answer columns of a survey frame.
+
+    Every selected column is replaced by its `encode_response` version, so later
+    aggregation and plotting can compare integer codes against one canonical vocabulary
+    ('yes', 'no', 'dont_know', ...) instead of re-cleaning strings on each call.
+
+    Only single-answer columns are encoded by default: `canonical_response` turns the
+    separator of a select-multiple answer into '_', so 'lack_school other' would become
+    one option 'lack_school_other'. Those columns (see `is_multiselect_column`) are kept
+    as they are, to be parsed by `survey_multiselect.multiselect_proportions`.
+
+    Parameters:
+    - df (DataFrame): Survey data. It is not modified.
+    - columns (list, optional): Columns to encode. Defaults to every single-answer column
+      (see `is_answer_column` and `is_multiselect_column`) not listed in `exclude`.
+    - exclude (tuple): Columns kept as they are, such as the population group labels or
+      multi-select questions with no combined answer in this data.
+
+    Returns:
+    - DataFrame: A new frame with the encoded columns.
+    """
+    if columns is None:
+        columns = [col for col in df.columns
+                   if col not in exclude and is_answer_column(df[col]) and not is_multiselect_column(df[col])]
+    return df.assign(**{col: encode_response(df[col]) for col in columns})
+
+
+def _cache_paths(csv_path, cache_dir, options):
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    if options:
+        stem = f"{stem}-{hashlib.sha1(options.encode('utf-8')).hexdigest()[:10]}"
+    extension = 'parquet' if CACHE_FORMAT == 'parquet' else 'pkl'
+    return os.path.join(cache_dir, f'{stem}.{extension}'), os.path.join(cache_dir, f'{stem}.json')
+
+
+def _read_cache(data_path):
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(data_path)
+    return pd.read_pickle(data_path)
+
+
+def _write_cache(df, data_path):
+    if CACHE_FORMAT == 'parquet':
+        df.to_parquet(data_path, index=False)
+    else:
+        df.to_pickle(data_path)
+
+
+def load_survey_csv(csv_path, cache_dir=None, categorical=True, refresh=False, **read_csv_kwargs):
+    """
+    Reads a UNHCR survey CSV through a typed columnar cache.
+
+    The first call parses the CSV with `pd.read_csv`, converts repeated text answers to
+    categorical columns and writes the result to `cache_dir` (Parquet when pyarrow is
+    installed, pickle otherwise). Later calls load the cache instead of re-parsing.
+    The cache is rebuilt automatically when the source file changes: a matching size and
+    modification time is trusted directly, otherwise the file's SHA-256 is compared with
+    the one stored next to the cache.
+
+    Parameters:
+    - csv_path (str): Path to the survey CSV (e.g. 'UNHCR_BGD_2023_msnahost_datai_anon_v.2.1.csv').
+    - cache_dir (str, optional): Cache folder. Defaults to '.survey_cache' next to the CSV.
+    - categorical (bool): Convert low-cardinality text columns to 'category'.
+    - refresh (bool): Ignore any existing cache and rebuild it.
+    - **read_csv_kwargs: Extra arguments passed to `pd.read_csv`; they are part of the cache key.
+
+    Returns:
+    - DataFrame: The survey data.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    options = repr(sorted(read_csv_kwargs.items())) if read_csv_kwargs else ''
+    if not categorical:
+        options += '|raw'
+    data_path, meta_path = _cache_paths(csv_path, cache_dir, options)
+
+    stat = os.stat(csv_path)
+    meta = None
+    if not refresh and os.path.exists(data_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    if meta is not None and meta.get('format') == CACHE_FORMAT:
+        if meta['size'] == stat.st_size and meta['mtime_ns'] == stat.st_mtime_ns:
+            return _read_cache(data_path)
+
+        # The file was touched or copied; only rebuild if its content really changed
+        sha256 = file_sha256(csv_path)
+        if sha256 == meta['sha256']:
+            meta.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            with open(meta_path, 'w') as f:
+                json.dump(meta, f)
+            return _read_cache(data_path)
+    else:
+        sha256 = file_sha256(csv_path)
+
+    df = pd.read_csv(csv_path, **read_csv_kwargs)
+    if categorical:
+        df = to_categorical(df)
+    _write_cache(df, data_path)
+
+    # Cold and warm loads must give the same frame: a cache that does not read back
+    # identically (values or dtypes) is dropped and the CSV is parsed on every call
+    if not _read_cache(data_path).equals(df):
+        os.remove(data_path)
+        warnings.warn(f'{csv_path} does not round-trip through the {CACHE_FORMAT} cache; '
+                      'it will be re-parsed on every load.')
+        return df
+
+    meta = {
+        'source': os.path.abspath(csv_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': sha256,
+        'format': CACHE_FORMAT,
+        'options': options,
+    }
+    with open(meta_path, 'w') as f:
+        json.dump(meta, f)
+
+    return df
+
+
+def clean_age(df, age_col='ageYears'):
+    """
+    Drops rows whose age is missing or top-coded as '60 or more' and casts the age
+    column to int8 (the top code keeps every remaining age well inside its range).
+    """
+    ages = pd.to_numeric(df[age_col].where(df[age_col] != '60 or more'), errors='coerce')
+    keep = ages.notna()
+    return df[keep].assign(**{age_col: ages[keep].astype('int8')})
+
+
+def filter_rows(df, age_range=None, groups=None, genders=None,
+                age_col='ageYears', group_col='Intro_07_1', gender_col='HH_02'):
+    """
+    Keeps the rows matching every given predicate.
+
+    Parameters:
+    - df (DataFrame): Roster rows with a numeric `age_col`.
+    - age_range (tuple, optional): Inclusive (min_age, max_age), e.g. (0, 17) for children.
+    - groups (list, optional): Population groups to keep (e.g. ['Refugees']).
+    - genders (list, optional): Genders to keep (e.g. ['Female']).
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if age_range is not None:
+        ages = df[age_col].to_numpy()
+        mask &= (ages >= age_range[0]) & (ages <= age_range[1])
+    if groups is not None:
+        mask &= df[group_col].isin(groups).to_numpy()
+    if genders is not None:
+        mask &= df[gender_col].isin(genders).to_numpy()
+    return df[mask]
+
+
+def iter_survey_chunks(csv_path, columns=None, age_range=(0, 17), groups=None, genders=None,
+                       dtypes=None, chunksize=100_000,
+                       age_col='ageYears', group_col='Intro_07_1', gender_col='HH_02'):
+    """
+    Streams a survey CSV as cleaned, filtered chunks without holding the whole file.
+
+    Each chunk holds at most `chunksize` CSV rows. Only the projected columns are parsed;
+    when `age_col` is set the chunk is age-cleaned (see `clean_age`) before the row
+    predicates are applied. Consumers such as `survey_stats.stream_proportions` can
+    aggregate chunk by chunk so memory stays constant in the number of rows.
+
+    Parameters:
+    - csv_path (str): Path to the roster or caregiver CSV.
+    - columns (list, optional): Columns to yield. Defaults to `ROSTER_COLUMNS`.
+    - age_range (tuple, optional): Inclusive age range. Defaults to children, (0, 17).
+    - groups (list, optional): Values of `group_col` to keep. Defaults to all groups.
+    - genders (list, optional): Values of `gender_col` to keep. Defaults to all genders.
+    - dtypes (dict, optional): Extra or overriding dtypes, merged into `ROSTER_DTYPES`.
+    - chunksize (int): Number of CSV rows parsed at a time.
+    - age_col (str or None): Age column; None skips age cleaning and the age predicate
+      (e.g. for the caregiver file, which has no age column).
+
+    Yields:
+    - DataFrame: The rows of one chunk passing the predicates, restricted to `columns`.
+    """
+    columns = list(ROSTER_COLUMNS if columns is None else columns)
+    if age_col is None:
+        age_range = None
+    predicate_cols = [age_col] if age_col is not None else []
+    if groups is not None:
+        predicate_cols.append(group_col)
+    if genders is not None:
+        predicate_cols.append(gender_col)
+    usecols = columns + [col for col in predicate_cols if col not in columns]
+
+    declared = {**ROSTER_DTYPES, **(dtypes or {})}
+    if age_col is not None:
+        declared[age_col] = 'str'
+    dtype = {col: kind for col, kind in declared.items() if col in usecols}
+
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtype, chunksize=chunksize):
+        if age_col is not None:
+            chunk = clean_age(chunk, age_col=age_col)
+        chunk = filter_rows(chunk, age_range=age_range, groups=groups, genders=genders,
+                            age_col=age_col, group_col=group_col, gender_col=gender_col)
+        yield chunk[columns]
+
+
+def load_roster(csv_path, columns=None, age_range=(0, 17), groups=None, genders=None,
+                dtypes=None, categorical=True, chunksize=100_000,
+                age_col='ageYears', group_col='Intro_07_1', gender_col='HH_02'):
+    """
+    Loads the FDS household roster keeping only the requested columns and rows.
+
+    The CSV is parsed in chunks with `iter_survey_chunks`, so peak memory follows the
+    selected subset (e.g. children) rather than the whole roster. With `categorical`, the
+    text answers of each chunk become categoricals as soon as it is read, and the chunks
+    are combined with `concat_categorical`.
+
+    Parameters:
+    - csv_path (str): Path to 'UNHCR_SSD_2023_FDS_data_roster.csv'.
+    - columns (list, optional): Columns to keep. Defaults to `ROSTER_COLUMNS`.
+    - age_range (tuple, optional): Inclusive age range. Defaults to children, (0, 17).
+    - groups (list, optional): Values of `group_col` to keep. Defaults to all groups.
+    - genders (list, optional): Values of `gender_col` to keep. Defaults to all genders.
+    - dtypes (dict, optional): Extra or overriding dtypes, merged into `ROSTER_DTYPES`.
+    - categorical (bool): Convert repeated text answers to 'category' (see `to_categorical`).
+    - chunksize (int): Number of CSV rows parsed at a time.
+
+    Returns:
+    - DataFrame: Roster rows that pass the predicates, indexed by their CSV row number.
+    """
+    columns = list(ROSTER_COLUMNS if columns is None else columns)
+    chunks = iter_survey_chunks(csv_path, columns=columns, age_range=age_range,
+                                groups=groups, genders=genders, dtypes=dtypes,
+                                chunksize=chunksize, age_col=age_col,
+                                group_col=group_col, gender_col=gender_col)
+    if not categorical:
+        pieces = list(chunks)
+        return pd.concat(pieces) if pieces else pd.DataFrame(columns=columns)
+
+    pieces = [_text_to_category(chunk) for chunk in chunks]
+    return concat_categorical(pieces) if pieces else pd.DataFrame(columns=columns)
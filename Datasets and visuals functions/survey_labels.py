@@ -0,0 +1,66 @@
+import csv
+import os
+import sys
+
+LABELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          'Northern_South_Sudan_Comparative _Analysis')
+
+FDS_LABEL_FILES = [
+    os.path.join(LABELS_DIR, 'UNHCR_SSD_2023_FDS_labels_caregiver.csv'),
+    os.path.join(LABELS_DIR, 'UNHCR_SSD_2023_FDS_labels_roster.csv'),
+]
+
+
+class LabelRegistry:
+    """
+    Maps survey variable codes (e.g. 'Intro_07_1', 'HH_Educ00') to their human labels.
+
+    The label files (CSV with 'VAR' and 'LABEL' columns) are read once, on the first
+    lookup, into a single dict with interned strings. Every later lookup is a dict access,
+    so charts rendered in a batch never re-read the files.
+
+    Parameters:
+    - paths (list): Label CSV files. When a code appears in several files the first one wins.
+    """
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._labels = None
+
+    def _load(self):
+        labels = {}
+        for path in self.paths:
+            with open(path, newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    labels.setdefault(sys.intern(row['VAR']), sys.intern(row['LABEL']))
+        self._labels = labels
+        return labels
+
+    @property
+    def labels(self):
+        return self._labels if self._labels is not None else self._load()
+
+    def get(self, var, default=None):
+        """
+        Returns the label of `var`, or `default` (the code itself when None) if unknown.
+        """
+        return self.labels.get(var, var if default is None else default)
+
+    def __getitem__(self, var):
+        return self.labels[var]
+
+    def __contains__(self, var):
+        return var in self.labels
+
+    def __len__(self):
+        return len(self.labels)
+
+
+FDS_LABELS = LabelRegistry(FDS_LABEL_FILES)
+
+
+def variable_label(var, default=None):
+    """
+    Human label of an FDS variable code, e.g. variable_label('Intro_07_1') -> 'Population group'.
+    """
+    return FDS_LABELS.get(var, default)
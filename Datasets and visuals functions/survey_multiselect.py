@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from survey_stats import ProportionTable
+
+
+def multiselect_matrix(values, options=None, sep=' ', merge_dict=None):
+    """
+    Parses a multi-select answer column into a sparse respondent x option indicator matrix.
+
+    All rows are split in one vectorized pass (`str.split` + `explode`); the matrix has a 1
+    where the respondent selected the option and is stored as CSR, so questions with many
+    options and few selections per respondent stay small.
+
+    Parameters:
+    - values (Series): Answers, e.g. df['edu_non_access_why'].
+    - options (list, optional): Options to keep (before merging); other selections are
+      ignored. Defaults to every option found.
+    - sep (str or None): Separator between the selected options (a space in Kobo exports of
+      select_multiple codes). None when each row holds one option label, as in the FDS files.
+    - merge_dict (dict, optional): Mapping used to merge options into broader categories.
+      An option merged twice in the same row counts once.
+
+    Returns:
+    - matrix (csr_matrix): Shape (len(values), len(categories)), values 0/1.
+    - categories (Index): Sorted option labels (after merging), one per column.
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    answered = values.dropna().astype(str)
+    selections = answered if sep is None else answered.str.split(sep).explode()
+    selections = selections.str.strip()
+    selections = selections[selections != '']
+    if options is not None:
+        selections = selections[selections.isin(options)]
+    if merge_dict:
+        selections = selections.replace(merge_dict)
+
+    codes, categories = pd.factorize(selections, sort=True)
+    matrix = sparse.csr_matrix((np.ones(len(codes)), (selections.index.to_numpy(), codes)),
+                               shape=(len(values), len(categories)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix, categories
+
+
+def multiselect_proportions(df, var, weight, options=None, sep=' ', merge_dict=None, group_col='Intro_07_1'):
+    """
+    Weighted share of respondents selecting each option of a multi-select question, per group.
+
+    The weighted and unweighted selection counts of every group x option cell come from a
+    single sparse product: the (2 * groups) x respondents design matrix holding each
+    respondent's weight and a 1 in their group's rows, times `multiselect_matrix`.
+
+    Parameters:
+    - df (DataFrame): Survey data containing `var`, `weight` and `group_col`.
+    - var (str): Multi-select column, e.g. 'edu_non_access_why' or 'MV6'.
+    - weight (str): Column with the survey weights.
+    - options, sep, merge_dict: As in `multiselect_matrix`.
+    - group_col (str): Column holding the population group.
+
+    Returns:
+    - ProportionTable: Share of the group's respondents (rows with at least one kept option)
+      selecting each option. With one option per row this is the same table as
+      `weighted_category_proportions`; otherwise the shares of a group can add up to more than 1.
+    """
+    selections, categories = multiselect_matrix(df[var], options, sep, merge_dict)
+    group_codes, groups = pd.factorize(df[group_col], sort=True)
+    respondents = np.flatnonzero((np.diff(selections.indptr) > 0) & (group_codes >= 0))
+    weights = df[weight].to_numpy(dtype=float)[respondents]
+    n_groups = len(groups)
+
+    design = sparse.csr_matrix(
+        (np.concatenate([weights, np.ones(len(respondents))]),
+         (np.concatenate([group_codes[respondents], n_groups + group_codes[respondents]]),
+          np.concatenate([respondents, respondents]))),
+        shape=(2 * n_groups, len(df))
+    )
+    cells = (design @ selections).toarray()
+    sums, counts = cells[:n_groups], np.rint(cells[n_groups:]).astype(np.int64)
+    totals = np.bincount(group_codes[respondents], weights=weights, minlength=n_groups)
+
+    # Only groups and options observed, as in `weighted_category_proportions`
+    rows = totals > 0
+    cols = counts.sum(axis=0) > 0
+    return ProportionTable(groups[rows], [str(category).title() for category in categories[cols]],
+                           sums[np.ix_(rows, cols)], counts[np.ix_(rows, cols)], totals=totals[rows])
@@ -0,0 +1,619 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+def weighted_group_sums(df, var, weight, var_values, merge_dict=None, group_col='Intro_07_1'):
+    """
+    Computes weighted and unweighted counts for every group x category cell of a
+    survey variable in a single pass over integer codes.
+
+    Parameters:
+    - df (DataFrame): Survey data containing `var`, `weight` and `group_col`.
+    - var (str): Column whose categories we want to count.
+    - weight (str): Column with the survey weights.
+    - var_values (list): Answers of `var` to keep; all other rows are ignored.
+    - merge_dict (dict, optional): Mapping used to merge raw answers into broader categories.
+    - group_col (str): Column holding the population group (e.g. 'Intro_07_1').
+
+    Returns:
+    - groups (Index): Sorted group labels.
+    - categories (Index): Sorted category values (after merging).
+    - sums (ndarray): Weighted counts with shape (len(groups), len(categories)).
+    - counts (ndarray): Unweighted counts with the same shape.
+    """
+    df, group_codes, groups, cat_codes, categories = _answer_codes(df, var, var_values, merge_dict, group_col)
+    weights = df[weight].to_numpy(dtype=float)
+    sums, counts = _cell_sums(group_codes, cat_codes, weights, len(groups), len(categories))
+    return groups, categories, sums, counts
+
+
+def _cell_sums(group_codes, cat_codes, weights, n_groups, n_cats):
+    cells = group_codes * n_cats + cat_codes
+    sums = np.bincount(cells, weights=weights, minlength=n_groups * n_cats)
+    counts = np.bincount(cells, minlength=n_groups * n_cats)
+    return sums.reshape(n_groups, n_cats), counts.reshape(n_groups, n_cats)
+
+
+def _merge_answers(values, merge_dict):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Merged labels are new categories, which a categorical column cannot take in place
+        values = values.astype(object)
+    return values.replace(merge_dict)
+
+
+def _answer_codes(df, var, var_values, merge_dict, group_col):
+    df = df[df[var].isin(var_values)]
+    values = df[var]
+    if merge_dict:
+        values = _merge_answers(values, merge_dict)
+
+    group_codes, groups = pd.factorize(df[group_col], sort=True)
+    cat_codes, categories = pd.factorize(values, sort=True)
+
+    # Rows with a missing group or category get code -1 and are dropped
+    valid = (group_codes >= 0) & (cat_codes >= 0)
+    return df[valid], group_codes[valid], groups, cat_codes[valid], categories
+
+
+def cluster_codes(df, cluster):
+    """
+    Integer cluster (e.g. household) id of every row of `df`. Rows with a missing
+    cluster id are counted as clusters of their own.
+    """
+    codes, uniques = pd.factorize(df[cluster])
+    missing = codes < 0
+    codes[missing] = len(uniques) + np.arange(missing.sum())
+    return codes
+
+
+def linearized_variances(group_codes, cat_codes, cluster_codes, weights, n_groups, n_cats):
+    """
+    Design-based (Taylor linearization) variance of every group x category proportion
+    when respondents are sampled in clusters, such as children of the same household.
+
+    Each group is its own stratum of clusters drawn with replacement. The linearized
+    residual of a proportion, w * (y - p) / W, is totalled per cluster and the variance is
+    n / (n - 1) * sum of the squared cluster totals, with n clusters in the group. The
+    rows are reduced once into (group, cluster) segments sorted by group, so the cost is
+    linear in rows for all categories at once.
+
+    Parameters:
+    - group_codes, cat_codes, cluster_codes (ndarray): Integer codes of each row.
+    - weights (ndarray): Survey weight of each row.
+    - n_groups, n_cats (int): Number of groups and categories.
+
+    Returns:
+    - ndarray: Variances with shape (n_groups, n_cats).
+    """
+    n_cluster_ids = int(cluster_codes.max()) + 1 if len(cluster_codes) else 1
+    pairs, pair_keys = pd.factorize(group_codes.astype(np.int64) * n_cluster_ids + cluster_codes, sort=True)
+    pair_group = np.asarray(pair_keys) // n_cluster_ids
+    n_pairs = len(pair_keys)
+
+    cluster_sums = np.bincount(pairs * n_cats + cat_codes, weights=weights,
+                               minlength=n_pairs * n_cats).reshape(n_pairs, n_cats)
+    cluster_totals = cluster_sums.sum(axis=1)
+
+    # Segment of each group among the sorted (group, cluster) pairs
+    starts = np.searchsorted(pair_group, np.arange(n_groups))
+    n_clusters = np.diff(np.append(starts, n_pairs))
+    present = n_clusters > 0
+
+    def segment_sums(values):
+        sums = np.zeros((n_groups, n_cats))
+        sums[present] = np.add.reduceat(values, starts[present], axis=0)
+        return sums
+
+    group_sums = segment_sums(cluster_sums)
+    totals = group_sums.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        p = group_sums / totals[:, None]
+        residuals = (cluster_sums - p[pair_group] * cluster_totals[:, None]) / totals[pair_group, None]
+        scale = n_clusters / (n_clusters - 1)
+        return scale[:, None] * segment_sums(residuals ** 2)
+
+
+
+class ProportionTable:
+    """
+    Weighted proportions of one survey variable, indexed by group and category.
+
+    Attributes:
+    - groups (list): Population group labels, one per row.
+    - categories (list): Category labels (title case), one per column.
+    - answers (list): The same categories as found in the data, before title-casing.
+    - weighted_counts (ndarray): Sum of weights per group x category cell.
+    - counts (ndarray): Unweighted number of respondents per cell.
+    - proportions (ndarray): Weighted proportion (0-1) of each category within its group.
+    - standard_errors (ndarray): Standard error of each proportion, matching
+      DescrStatsW(..., ddof=0).std_mean, or the design-based one when `variances` is given.
+    - design_effects (ndarray or None): Design variance over the simple random sampling
+      variance p(1-p)/(n-1) of each proportion, when `variances` is given.
+
+    `totals` (weighted respondents per group) is only needed for multi-select questions,
+    where a respondent can count in several categories; it defaults to the row sums.
+    """
+
+    def __init__(self, groups, categories, weighted_counts, counts, variances=None, totals=None, answers=None):
+        self.groups = list(groups)
+        self.categories = list(categories)
+        self.answers = self.categories if answers is None else list(answers)
+        self.weighted_counts = np.asarray(weighted_counts, dtype=float)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+        if totals is None:
+            totals = self.weighted_counts.sum(axis=1, keepdims=True)
+        else:
+            totals = np.asarray(totals, dtype=float).reshape(-1, 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self.proportions = self.weighted_counts / totals
+            if variances is None:
+                self.standard_errors = np.sqrt(self.proportions * (1 - self.proportions) / (totals - 1))
+                self.design_effects = None
+            else:
+                variances = np.asarray(variances, dtype=float)
+                respondents = self.counts.sum(axis=1, keepdims=True)
+                self.standard_errors = np.sqrt(variances)
+                self.design_effects = variances / (self.proportions * (1 - self.proportions) / (respondents - 1))
+
+        self._group_index = {group: i for i, group in enumerate(self.groups)}
+        self._category_index = {category: j for j, category in enumerate(self.categories)}
+
+    def percentages(self, groups, categories):
+        """
+        Returns a (len(groups), len(categories)) array of percentages (0-100).
+        Categories that were not observed are reported as 0.
+        """
+        values = np.zeros((len(groups), len(categories)))
+        cols = [self._category_index.get(category) for category in categories]
+        for i, group in enumerate(groups):
+            row = self._group_index[group]
+            for j, col in enumerate(cols):
+                if col is not None:
+                    values[i, j] = self.proportions[row, col] * 100
+        return values
+
+    def confidence_intervals(self, confidence=0.95):
+        """
+        Normal-approximation bounds (0-1) of every proportion, p -/+ z * standard error.
+
+        Returns:
+        - lower, upper (ndarray): Arrays shaped like `proportions`.
+        """
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        margin = z * self.standard_errors
+        return self.proportions - margin, self.proportions + margin
+
+    def to_frame(self, confidence=None):
+        """
+        Returns the table in long format with one row per group x category cell.
+        With a `confidence` level (e.g. 0.95), 'ci_lower' and 'ci_upper' columns are added,
+        and design-based tables also get a 'design_effect' column.
+        """
+        n_groups, n_cats = self.proportions.shape
+        frame = pd.DataFrame({
+            'group': np.repeat(self.groups, n_cats),
+            'category': np.tile(self.categories, n_groups),
+            'weighted_percentage': self.proportions.ravel() * 100,
+            'standard_error': self.standard_errors.ravel() * 100,
+            'count': self.counts.ravel(),
+        })
+        if confidence is not None:
+            lower, upper = self.confidence_intervals(confidence)
+            frame['ci_lower'] = lower.ravel() * 100
+            frame['ci_upper'] = upper.ravel() * 100
+        if self.design_effects is not None:
+            frame['design_effect'] = self.design_effects.ravel()
+        return frame
+
+    def __repr__(self):
+        return self.to_frame().to_string(index=False)
+
+
+def weighted_category_proportions(df, var, weight, var_values, merge_dict=None,
+                                  group_col='Intro_07_1', groups=None, cluster=None):
+    """
+    Weighted proportion of each answer of `var` for every population group.
+
+    Vectorized replacement for the `weighted_category_proportions2` helper used in the
+    South Sudan notebooks: instead of building a dummy matrix and a DescrStatsW object
+    per group, all groups are aggregated at once with `weighted_group_sums`.
+
+    Parameters:
+    - df (DataFrame): Dataframe that has the column we are viewing.
+    - var (str): Column we want to get the weighted rate for.
+    - weight (str): Column with the weight values.
+    - var_values (list): Unique values in the `var` column we would like to get the rates of.
+    - merge_dict (dict, optional): Mapping used to merge answers into broader categories.
+    - group_col (str): Column holding the population group. Defaults to 'Intro_07_1'.
+    - groups (list, optional): Groups to report. Defaults to every group found in `group_col`.
+    - cluster (str, optional): Cluster id column (e.g. 'ID' for FDS households). When given,
+      standard errors account for the clustering (see `linearized_variances`) and the
+      table carries design effects.
+
+    Returns:
+    - ProportionTable: Proportions, standard errors and counts per group and category.
+    """
+    if cluster is None:
+        group_labels, categories, sums, counts = weighted_group_sums(
+            df, var, weight, var_values, merge_dict=merge_dict, group_col=group_col
+        )
+        return _proportion_table(group_labels, categories, sums, counts, groups)
+
+    df, group_codes, group_labels, cat_codes, categories = _answer_codes(df, var, var_values, merge_dict, group_col)
+    weights = df[weight].to_numpy(dtype=float)
+    n_groups, n_cats = len(group_labels), len(categories)
+    sums, counts = _cell_sums(group_codes, cat_codes, weights, n_groups, n_cats)
+    variances = linearized_variances(group_codes, cat_codes, cluster_codes(df, cluster), weights, n_groups, n_cats)
+    return _proportion_table(group_labels, categories, sums, counts, groups, variances)
+
+
+def _proportion_table(group_labels, categories, sums, counts, groups=None, variances=None):
+    if groups is not None:
+        # Reorder rows to the requested groups; groups without data get empty rows
+        group_labels = pd.Index(group_labels)
+        group_sums = np.zeros((len(groups), len(categories)))
+        group_counts = np.zeros((len(groups), len(categories)), dtype=np.int64)
+        group_variances = np.full((len(groups), len(categories)), np.nan)
+        for i, group in enumerate(groups):
+            if group in group_labels:
+                row = group_labels.get_loc(group)
+                group_sums[i] = sums[row]
+                group_counts[i] = counts[row]
+                if variances is not None:
+                    group_variances[i] = variances[row]
+        group_labels, sums, counts = groups, group_sums, group_counts
+        variances = None if variances is None else group_variances
+
+    return ProportionTable(group_labels, [str(category).title() for category in categories], sums, counts,
+                           variances, answers=categories)
+
+
+def partition_category_proportions(partitions, var, weight, var_values, merge_dict=None, encoder=None,
+                                   cluster=None):
+    """
+    Same result as `weighted_category_proportions`, for data held as one frame per group
+    (see `survey_dataset.PartitionedSurvey`). Each partition is aggregated on its own, so
+    no combined frame or group column is needed.
+
+    Parameters:
+    - partitions (dict): Group name -> DataFrame, in reporting order.
+    - var, weight, merge_dict: As in `weighted_category_proportions`.
+    - var_values (list or None): Answers to keep; None keeps every non-missing answer.
+    - encoder (callable, optional): Applied to each partition's `var` column before
+      filtering, e.g. `survey_io.encode_response` to match answers on canonical codes.
+    - cluster (str, optional): Cluster id column (e.g. 'pseudo_parent_id' in Bangladesh);
+      each partition is then a stratum of its own, see `weighted_category_proportions`.
+
+    Returns:
+    - ProportionTable: One row per partition, in the order of `partitions`.
+    """
+    per_group = []
+    for df in partitions.values():
+        if var not in df.columns:
+            # e.g. a question only asked to one population
+            per_group.append((np.array([], dtype=np.intp), pd.Index([]), np.array([]), np.array([], dtype=np.intp)))
+            continue
+        values = df[var] if encoder is None else encoder(df[var])
+        keep = (values.notna() if var_values is None else values.isin(var_values)).to_numpy()
+        values = values[keep]
+        if merge_dict:
+            values = _merge_answers(values, merge_dict)
+        codes, categories = pd.factorize(values, sort=True)
+        clusters = None if cluster is None else cluster_codes(df[keep], cluster)
+        per_group.append((codes, categories, df[weight].to_numpy(dtype=float)[keep], clusters))
+
+    categories = pd.Index([])
+    for _, group_categories, _, _ in per_group:
+        categories = categories.union(pd.Index(group_categories))
+
+    sums = np.zeros((len(per_group), len(categories)))
+    counts = np.zeros((len(per_group), len(categories)), dtype=np.int64)
+    variances = None if cluster is None else np.full((len(per_group), len(categories)), np.nan)
+    for i, (codes, group_categories, weights, clusters) in enumerate(per_group):
+        valid = codes >= 0
+        cells = categories.get_indexer(group_categories)[codes[valid]]
+        sums[i] = np.bincount(cells, weights=weights[valid], minlength=len(categories))
+        counts[i] = np.bincount(cells, minlength=len(categories))
+        if variances is not None and valid.any():
+            variances[i] = linearized_variances(np.zeros(valid.sum(), dtype=np.intp), cells, clusters[valid],
+                                                weights[valid], 1, len(categories))[0]
+
+    return _proportion_table(list(partitions), categories, sums, counts, variances=variances)
+
+
+def weighted_confidence_intervals(data, variables, weight='weights', group_col='group',
+                                  confidence=0.95, encoder=None, cluster=None):
+    """
+    Weighted proportions, standard errors and confidence intervals of several variables.
+
+    Every variable is aggregated for all groups and answers at once (see
+    `weighted_group_sums`), instead of re-filtering the data per group and per answer.
+    Without `cluster`, the standard error is the one of the Bangladesh tables,
+    sqrt(p(1-p)/W) with W the total weight of the group, and answers keep their spelling
+    in the data (e.g. 'yes').
+
+    Parameters:
+    - data (DataFrame or PartitionedSurvey): Survey rows. A DataFrame is split on `group_col`.
+    - variables (list or dict): Columns to summarize, or column -> answers to keep
+      (None keeps every non-missing answer).
+    - weight (str): Column with the survey weights.
+    - group_col (str): Group column of a DataFrame `data`.
+    - confidence (float): Confidence level of the intervals.
+    - encoder (callable, optional): Applied to each variable first, e.g.
+      `survey_io.encode_response` to match answers on canonical codes.
+    - cluster (str, optional): Cluster id column for design-based standard errors
+      ('pseudo_parent_id' in Bangladesh, 'ID' in the FDS roster).
+
+    Returns:
+    - DataFrame: One row per variable x group x observed answer with the columns variable,
+      group, category, weighted_percentage, standard_error, count, ci_lower and ci_upper
+      (percentages), plus design_effect when `cluster` is given.
+    """
+    if not isinstance(variables, dict):
+        variables = dict.fromkeys(variables)
+    partitions = getattr(data, 'partitions', None)
+
+    frames = []
+    for var, var_values in variables.items():
+        if partitions is not None:
+            table = partition_category_proportions(partitions, var, weight, var_values, encoder=encoder,
+                                                   cluster=cluster)
+        else:
+            df = data if encoder is None else data.assign(**{var: encoder(data[var])})
+            if var_values is None:
+                var_values = df[var].dropna().unique()
+            table = weighted_category_proportions(df, var, weight, list(var_values), group_col=group_col,
+                                                  cluster=cluster)
+        frame = table.to_frame(confidence=confidence)
+        frame['category'] = np.tile(table.answers, len(table.groups))
+        if cluster is None:
+            totals = table.weighted_counts.sum(axis=1, keepdims=True)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                standard_errors = np.sqrt(table.proportions * (1 - table.proportions) / totals)
+            margin = NormalDist().inv_cdf(0.5 + confidence / 2) * standard_errors
+            frame['standard_error'] = standard_errors.ravel() * 100
+            frame['ci_lower'] = (table.proportions - margin).ravel() * 100
+            frame['ci_upper'] = (table.proportions + margin).ravel() * 100
+        frame.insert(0, 'variable', var)
+        frames.append(frame[frame['count'] > 0])
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def stacked_category_proportions(df, variables, weight, fill_value=None, any_of=None, group_col='Intro_07_1'):
+    """
+    Weighted proportions of several variables answered on the same scale (e.g. the six
+    Washington Group difficulty questions Dis_03 ... Dis_18) in a single pass.
+
+    The answers are coded once into a rows x variables matrix over the shared vocabulary,
+    and one `np.bincount` over the stacked (variable, group, answer) cells gives the sums of
+    every variable. Composite indicators (`any_of`) are extra columns of the same matrix.
+
+    Parameters:
+    - df (DataFrame): Survey data containing the variables, `weight` and `group_col`.
+    - variables (dict): Column -> answers to keep, as `var_values` of
+      `weighted_category_proportions`.
+    - weight (str): Column with the survey weights.
+    - fill_value (str, optional): Answer given to missing values before counting (e.g.
+      'no difficulty' where the question was skipped). `df` itself is not modified.
+    - any_of (dict, optional): Composite name -> answers, e.g.
+      {'any_difficulty': ['a lot of difficulty', 'cannot do at all']}. A row answers 'yes'
+      when any of the variables holds one of these answers, 'no' when it answered at
+      least one of them otherwise (title-cased to 'Yes'/'No' in the ProportionTable, like
+      every category). Answers kept by none of the variables never match.
+    - group_col (str): Column holding the population group.
+
+    Returns:
+    - dict: Column (or composite name) -> ProportionTable, as `weighted_category_proportions`
+      would return it for that column.
+    """
+    columns = list(variables)
+    answers = df[columns].astype(object)
+    if fill_value is not None:
+        answers = answers.fillna(fill_value)
+
+    vocabulary = pd.Index(sorted({answer for values in variables.values() for answer in values}, key=str))
+    codes = np.column_stack([vocabulary.get_indexer(answers[col]) for col in columns])
+    for j, col in enumerate(columns):
+        # Answers of the shared vocabulary that this variable does not keep
+        kept = np.append(vocabulary.isin(variables[col]), False)
+        codes[~kept[codes[:, j]], j] = -1
+
+    names = columns
+    categories = vocabulary
+    if any_of:
+        answered = (codes >= 0).any(axis=1)
+        composites = []
+        for name, flagged_answers in any_of.items():
+            flagged_codes = vocabulary.get_indexer(flagged_answers)
+            # Unknown answers get -1, the code of missing answers: they must not match those
+            flagged = np.isin(codes, flagged_codes[flagged_codes >= 0]).any(axis=1)
+            # 'no' and 'yes' are appended after the vocabulary
+            composites.append(np.where(answered, len(vocabulary) + flagged, -1))
+        codes = np.column_stack([codes] + composites)
+        names = columns + list(any_of)
+        categories = vocabulary.append(pd.Index(['no', 'yes']))
+
+    group_codes, groups = pd.factorize(df[group_col], sort=True)
+    n_vars, n_groups, n_cats = len(names), len(groups), len(categories)
+    valid = (codes >= 0) & (group_codes >= 0)[:, None]
+    var_index = np.broadcast_to(np.arange(n_vars), codes.shape)[valid]
+    row_groups = np.broadcast_to(group_codes[:, None], codes.shape)[valid]
+    weights = np.broadcast_to(df[weight].to_numpy(dtype=float)[:, None], codes.shape)[valid]
+
+    cells = (var_index * n_groups + row_groups) * n_cats + codes[valid]
+    size = n_vars * n_groups * n_cats
+    sums = np.bincount(cells, weights=weights, minlength=size).reshape(n_vars, n_groups, n_cats)
+    counts = np.bincount(cells, minlength=size).reshape(n_vars, n_groups, n_cats)
+
+    results = {}
+    for v, name in enumerate(names):
+        # Only the groups and answers observed for this variable
+        rows = counts[v].sum(axis=1) > 0
+        cols = counts[v].sum(axis=0) > 0
+        results[name] = _proportion_table(groups[rows], categories[cols],
+                                          sums[v][np.ix_(rows, cols)], counts[v][np.ix_(rows, cols)])
+    return results
+
+
+class ProportionAccumulator:
+    """
+    Builds the same result as `weighted_category_proportions` from data arriving in chunks.
+
+    Only the group x category weighted sums and counts are kept between chunks, so a
+    roster of any size can be aggregated without holding it in memory.
+
+    Parameters:
+    - var, weight, var_values, merge_dict, group_col: As in `weighted_category_proportions`.
+    """
+
+    def __init__(self, var, weight, var_values, merge_dict=None, group_col='Intro_07_1'):
+        self.var = var
+        self.weight = weight
+        self.var_values = var_values
+        self.merge_dict = merge_dict
+        self.group_col = group_col
+        self._groups = {}
+        self._categories = {}
+        self._sums = np.zeros((0, 0))
+        self._counts = np.zeros((0, 0), dtype=np.int64)
+
+    def update(self, df):
+        """
+        Adds the weighted sums of one chunk of survey rows.
+        """
+        groups, categories, sums, counts = weighted_group_sums(
+            df, self.var, self.weight, self.var_values,
+            merge_dict=self.merge_dict, group_col=self.group_col
+        )
+        rows = [self._groups.setdefault(group, len(self._groups)) for group in groups]
+        cols = [self._categories.setdefault(category, len(self._categories)) for category in categories]
+
+        shape = (len(self._groups), len(self._categories))
+        if shape != self._sums.shape:
+            grown_sums = np.zeros(shape)
+            grown_counts = np.zeros(shape, dtype=np.int64)
+            old_rows, old_cols = self._sums.shape
+            grown_sums[:old_rows, :old_cols] = self._sums
+            grown_counts[:old_rows, :old_cols] = self._counts
+            self._sums, self._counts = grown_sums, grown_counts
+
+        self._sums[np.ix_(rows, cols)] += sums
+        self._counts[np.ix_(rows, cols)] += counts
+        return self
+
+    def result(self, groups=None):
+        """
+        Returns the accumulated ProportionTable, with groups and categories sorted as in
+        `weighted_category_proportions`.
+        """
+        group_labels = pd.Index(list(self._groups))
+        categories = pd.Index(list(self._categories))
+        row_order = group_labels.argsort()
+        col_order = categories.argsort()
+        sums = self._sums[np.ix_(row_order, col_order)]
+        counts = self._counts[np.ix_(row_order, col_order)]
+        return _proportion_table(group_labels[row_order], categories[col_order], sums, counts, groups)
+
+
+def stream_proportions(chunks, accumulators):
+    """
+    Feeds every chunk to each accumulator in a single pass over the data.
+
+    Parameters:
+    - chunks (iterable of DataFrame): e.g. `survey_io.iter_survey_chunks(...)`.
+    - accumulators (dict): Result name -> ProportionAccumulator.
+
+    Returns:
+    - dict: Result name -> ProportionTable.
+    """
+    for chunk in chunks:
+        for accumulator in accumulators.values():
+            accumulator.update(chunk)
+    return {name: accumulator.result() for name, accumulator in accumulators.items()}
+
+
+def percentage_matrix(results, groups, categories):
+    """
+    Percentages (0-100) of `categories` for each of `groups`, as a (groups x categories) array.
+
+    Parameters:
+    - results (ProportionTable or dict): Output of `weighted_category_proportions`, or a
+      legacy nested dict of '<Category> -----> (%)' percentage strings.
+    - groups (list): Group labels, in plotting order.
+    - categories (list): Category labels, in plotting order. Missing categories count as 0.
+    """
+    if isinstance(results, ProportionTable):
+        return results.percentages(groups, categories)
+
+    return np.array([
+        [float(str(results[group].get(f'{cat} -----> (%)', '0')).replace('%', '')) for cat in categories]
+        for group in groups
+    ])
+
+
+def result_groups(results):
+    """
+    Group labels of a ProportionTable or legacy results dict, in their stored order.
+    """
+    if isinstance(results, ProportionTable):
+        return list(results.groups)
+    return list(results.keys())
+
+
+def top_categories(results, n=None, threshold=None, groups=None, labels=None):
+    """
+    Ranks the categories of each group, keeping the top `n` and/or those at or above
+    `threshold` percent, largest first.
+
+    The top `n` of every group are selected at once with `np.argpartition`, so only the
+    selected cells are sorted. Neither `results` nor `labels` are modified.
+
+    Parameters:
+    - results (ProportionTable or dict): Output of `weighted_category_proportions` (or
+      `multiselect_proportions`), or a dict of group -> {category: percentage}, where
+      percentages may be strings with a '%' symbol.
+    - n (int, optional): Number of categories kept per group. Defaults to all of them.
+    - threshold (float, optional): Minimum percentage (0-100) of a kept category.
+    - groups (list, optional): Groups to rank, in output order. Defaults to every group.
+    - labels (dict, optional): Category -> display label, e.g. shorter reason names.
+
+    Returns:
+    - dict: Group -> {label: percentage}, largest percentage first. Categories at 0% are
+      never listed.
+    """
+    if isinstance(results, ProportionTable):
+        categories = list(results.categories)
+        groups = result_groups(results) if groups is None else list(groups)
+        values = results.percentages(groups, categories)
+    else:
+        groups = list(results) if groups is None else list(groups)
+        categories = list(dict.fromkeys(category for group in groups for category in results[group]))
+        values = np.array([
+            [float(str(results[group].get(category, 0)).replace('%', '')) for category in categories]
+            for group in groups
+        ]).reshape(len(groups), len(categories))
+
+    k = values.shape[1] if n is None else min(n, values.shape[1])
+    if k < values.shape[1]:
+        selected = np.argpartition(-values, k - 1, axis=1)[:, :k]
+    else:
+        selected = np.tile(np.arange(values.shape[1]), (len(groups), 1))
+    selected_values = np.take_along_axis(values, selected, axis=1)
+    order = np.argsort(-selected_values, axis=1, kind='stable')
+    selected = np.take_along_axis(selected, order, axis=1)
+    selected_values = np.take_along_axis(selected_values, order, axis=1)
+
+    keep = selected_values > 0
+    if threshold is not None:
+        keep &= selected_values >= threshold
+
+    labels = labels or {}
+    ranked = {}
+    for i, group in enumerate(groups):
+        ranked[group] = {labels.get(categories[j], categories[j]): float(value)
+                         for j, value, kept in zip(selected[i], selected_values[i], keep[i]) if kept}
+    return ranked